@@ -1,175 +1,923 @@
-# Author: Anuoluwapo Osinubi
-# Program Goal: The purpose of Kwikaweb Domain Checker application is to provide a graphical user interface (GUI) for checking the availability 
-# of domain names and obtaining relevant domain information. It aims to simplify the process of searching for domain availability
-# and retrieving essential details for users who are interested in registering or acquiring domain names.
-
-# Import necessary libraries
-import tkinter as tk   # tkinter for creating and managing the GUI
-import whois   # whois for checking domain availability and fetching domain information
-from PIL import Image, ImageTk   # PIL for image manipulation (resize, conversion to PhotoImage, etc.)
-import io   # io for reading raw bytes data (used when loading images)
-import urllib.request   # urllib for making HTTP requests to fetch images from URLs
-
-class DomainInfoGUI:
-    def __init__(self):
-        # Initialize main application window
-        self.window = tk.Tk() # Creating an instance of Tk class which represents the main window
-        self.window.state('zoomed') # Set the initial state of the window as zoomed/full-screen
-        self.window.title("Domain Name Search") # Set the title of the window
-
-        # Load and display the application logo
-        self.logo_img_url = "https://kwikaweb.com/wp-content/uploads/2023/07/Kwikaweb-PNG.png" # URL of the logo image
-        self.logo_img = self.load_image_from_url(self.logo_img_url, (238, 40)) # Call custom function to load the image from URL and resize it
-        self.logo_img_label = tk.Label(self.window, image=self.logo_img) # Creating a label to hold the image
-        self.logo_img_label.pack(pady=10) # Displaying the label on the window with padding on the y-axis
-
-        # Create a menu bar in the application window
-        self.menu = tk.Menu(self.window) # Creating an instance of Menu class
-        self.window.config(menu=self.menu) # Adding the menu to the window
-
-        # Adding menu options with their respective command functions
-        self.menu.add_command(label="Domain Name Search", command=self.check_domain_availability) # 'Domain Name Search' menu option
-        self.menu.add_command(label="WHOIS Lookup", command=self.whois_lookup_window) # 'WHOIS Lookup' menu option
-
-        self.lbl_domain = tk.Label(self.window, text="Search for your Domain Name with ease:") # Creating a label widget for instructing the user.
-        self.lbl_domain.pack(pady=10) # Packing it into the window with some padding along the y-axis.
-
-        self.entry_domain = tk.Entry(self.window, width=30) # Creating an entry widget that will be used to capture user input. The domain name that the user wants to search for will be typed here.
-        self.entry_domain.pack(pady=5) # Packing it into the window with some padding along the y-axis.
-
-        self.btn_search = tk.Button(self.window, text="Search Availability", command=self.check_domain_availability) # Creating a search button. When clicked, it triggers the check_domain_availability function to verify the availability of the entered domain.
-        self.btn_search.pack(pady=10) # Packing it into the window with some padding along the y-axis.
-
-        self.btn_whois = tk.Button(self.window, text="WHOIS Lookup", command=self.whois_lookup_window) # Creating a WHOIS button. When clicked, it triggers the whois_lookup_window function to display a window where the WHOIS information of a domain can be viewed.
-        self.btn_whois.pack(pady=10) # Packing it into the window with some padding along the y-axis.
-
-        self.btn_exit = tk.Button(self.window, text="Exit", command=self.exit_app) # Creating an exit button. When clicked, it triggers the exit_app function which closes the application.
-        self.btn_exit.pack(pady=10) # Packing it into the window with some padding along the y-axis.
-
-        self.main_window_img_url = "https://kwikaweb.com/wp-content/uploads/2023/07/Domain-Name-Registration-and-Transfer-Image.png" # Setting the URL of the main window image. The URL is where the image file is hosted online.
-        self.main_window_img_alt_text = "Domain Name Registration and Transfer Image" # Setting the alternative text for the main window image. This text is useful for accessibility and when the image cannot be loaded.
-        self.main_window_img = self.load_image_from_url(self.main_window_img_url, (226, 195), alt_text=self.main_window_img_alt_text) # Calling the function 'load_image_from_url' to fetch and process the image from the provided URL. The function takes the URL, the desired size of the image (226x195 in this case) and the alternative text as parameters.
-        self.main_window_img_label = tk.Label(self.window, image=self.main_window_img) # Creating a label widget to display the fetched image in the GUI.
-        self.main_window_img_label.pack() # Packing the image label widget into the window.
-
-        self.whois_window = None # Setting 'self.whois_window' to None. This is the initialization for the WHOIS lookup window which will be defined later in the program.
-
-        
-    def center_window(self, window): # This function is used to center a given window on the screen
-        window.update_idletasks() # First, we update the window's idle tasks to ensure we have the most recent size info
-        width = window.winfo_width() # Get the width of the window
-        height = window.winfo_height() # Get the height of the window
-        # Calculate the position to center the window
-        x = (window.winfo_screenwidth() // 2) - (width // 2)
-        y = (window.winfo_screenheight() // 2) - (height // 2)
-        window.geometry('{}x{}+{}+{}'.format(width, height, x, y)) # Set the geometry of the window to center it
-    
-    def check_domain_availability(self): # This method checks if a domain is available by calling the is_domain_available function. It will open a new window with the result message.
-        domain_name = self.entry_domain.get() # Retrieving the domain name from the entry widget.
-        availability = self.is_domain_available(domain_name) # Call the function is_domain_available with the domain name to check if it is available.
-        
-        # If the domain is available, the message will say it is available. If not, it will say it is not available.
-        if availability:
-            message = f"The domain '{domain_name}' is available!"
-        else:
-            message = f"The domain '{domain_name}' is not available."
-
-        result_window = tk.Toplevel(self.window) # Create a new toplevel window to show the result message.
-        result_window.geometry('300x100') # Set the size of the result window.
-        result_label = tk.Label(result_window, text=message) # Create a label with the message text and add it to the result window.
-        result_label.pack(pady=10) # Pack the label with a padding in the y direction.
-
-        btn_back = tk.Button(result_window, text="Back To Search", command=result_window.destroy) # Create a button for going back to the search. When this button is pressed, the result window is destroyed.
-        btn_back.pack(pady=10) # Pack the button with a padding in the y direction.
-
-        self.center_window(result_window) # Center the result window on the screen.
-
-    # This method checks if a domain is available by using the whois library.
-    # It returns True if the domain is available, and False otherwise.
-    def is_domain_available(self, domain_name): 
-        try:
-            # Try to get whois information for the domain. If the domain is taken, this will succeed.
-            w = whois.whois(domain_name)
-            return False
-            # If getting whois information fails with a PywhoisError, this means the domain is available.
-        except whois.parser.PywhoisError:
-            return True
-    
-    def whois_lookup_window(self): # This method creates a new window for WHOIS lookup.
-        self.whois_window = tk.Toplevel(self.window) # Create a new toplevel window for WHOIS lookup.
-        self.whois_window.title("WHOIS Lookup") # Set the title of the WHOIS window.
-        self.whois_window.state('zoomed') # Maximize the WHOIS window.
-
-        self.logo_img_label = tk.Label(self.whois_window, image=self.logo_img) # Create a label with the logo image and add it to the WHOIS window.
-        self.logo_img_label.pack(pady=10) # Add the label to the window with padding in the y direction.
-
-        self.whois_menu = tk.Menu(self.whois_window) # Create a menu for the WHOIS window.
-        self.whois_window.config(menu=self.whois_menu) # Set the menu of the WHOIS window.
-        
-        # Add commands to the WHOIS window menu.
-        self.whois_menu.add_command(label="Domain Name Search", command=self.back_to_main_window) # Go back to the main window for domain name search.
-        self.whois_menu.add_command(label="WHOIS Lookup", command=self.whois_lookup_window) # Open the WHOIS lookup window.
-
-        self.whois_lbl_domain = tk.Label(self.whois_window, text="Enter Domain Name") # Create a label prompting the user to enter a domain name.
-        self.whois_lbl_domain.pack(pady=10) # Add the label to the window with padding in the y direction.
-
-        self.whois_entry_domain = tk.Entry(self.whois_window, width=30) # Create an entry field for the user to enter a domain name.
-        self.whois_entry_domain.pack(pady=5) # Add the entry field to the window with padding in the y direction.
-
-        self.whois_btn_search = tk.Button(self.whois_window, text="Get WHOIS Information", command=self.get_whois_info) # Create a button to initiate the WHOIS lookup.
-        self.whois_btn_search.pack(pady=10) # Add the button to the window with padding in the y direction.
-
-        self.whois_btn_back = tk.Button(self.whois_window, text="Domain Name Search", command=self.back_to_main_window) # Create a button to go back to the domain name search.
-        self.whois_btn_back.pack(pady=10) # Add the button to the window with padding in the y direction.
-
-        self.whois_btn_exit = tk.Button(self.whois_window, text="Exit", command=self.exit_app) # Create a button to exit the application.
-        self.whois_btn_exit.pack(pady=10) # Add the button to the window with padding in the y direction.
-
-        self.whois_window_img_url = "https://kwikaweb.com/wp-content/uploads/2023/07/Domain-Name-Registration-Image.png" # Define the URL of the image to be loaded for the WHOIS lookup window.
-        self.whois_window_img_alt_text = "WHOIS Lookup Image" # Set an alternate text for the image. This is typically used for accessibility purposes.
-        self.whois_window_img = self.load_image_from_url(self.whois_window_img_url, (226, 195), alt_text=self.whois_window_img_alt_text)  # Use the helper function load_image_from_url() to load the image from the provided URL. The image is resized to the dimensions (226, 195), and the alternate text is also set.
-        self.whois_window_img_label = tk.Label(self.whois_window, image=self.whois_window_img) # Create a Tkinter Label widget, set the image loaded from the URL as the label's image, and assign this label to the 'whois_window_img_label' attribute.
-        self.whois_window_img_label.pack() # Pack (position) the label widget in the window with default settings (centered alignment).
-
-    def get_whois_info(self): # This method retrieves WHOIS information for a given domain.
-        domain_name = self.whois_entry_domain.get() # Get the domain name from the entry field.
-        w = whois.whois(domain_name) # Retrieve the WHOIS information for the domain.
-
-        whois_info_window = tk.Toplevel(self.whois_window) # Create a new toplevel window to display the WHOIS information.
-        whois_info_window.geometry('500x350') # Set the size of the window.
-
-        lbl_whois = tk.Label(whois_info_window, text="WHOIS information of "+ domain_name +": ") # Create a label to display the domain name.
-        lbl_whois.pack(pady=10) # Add the label to the window with padding in the y direction.
-
-        txt_whois = tk.Text(whois_info_window, height=15, width=70) # Create a text box to display the WHOIS information.
-        txt_whois.pack(pady=5) # Add the text box to the window with padding in the y direction.
-        txt_whois.insert(tk.END, str(w)) # Insert the WHOIS information into the text box.
-
-        btn_back = tk.Button(whois_info_window, text="Back To Search", command=whois_info_window.destroy) # Create a button to close the WHOIS information window and go back to search.
-        btn_back.pack(pady=10) # Add the button to the window with padding in the y direction.
-
-        self.center_window(whois_info_window) # Center the WHOIS information window on the screen.
-
-    def exit_app(self): # This method closes the main application window.
-        self.window.destroy() # Destroy the main application window.
-
-    def back_to_main_window(self): # This method closes the WHOIS lookup window and goes back to the main window.
-        self.whois_window.destroy() # Destroy the WHOIS lookup window.
-        
-        # Function to fetch an image from a URL and convert it to a PhotoImage after resizing
-    def load_image_from_url(self, url, size=None, alt_text=None):
-        # First, we read the raw data from the URL
-        with urllib.request.urlopen(url) as u:
-            raw_data = u.read()
-        # Then, we open the image from the raw data and resize it
-        im = Image.open(io.BytesIO(raw_data))
-        if size is not None:
-            im = im.resize(size, Image.BICUBIC)
-        # Finally, we convert the image object to a PhotoImage and return it
-        image = ImageTk.PhotoImage(im)
-        if alt_text is not None:
-            image.alt = alt_text
-        return image
-
-domain_info_gui = DomainInfoGUI() # Create an instance of the DomainInfoGUI class
-domain_info_gui.window.mainloop() # Start the main event loop of the application
\ No newline at end of file
+# Author: Anuoluwapo Osinubi
+# Program Goal: The purpose of Kwikaweb Domain Checker application is to provide a graphical user interface (GUI) for checking the availability 
+# of domain names and obtaining relevant domain information. It aims to simplify the process of searching for domain availability
+# and retrieving essential details for users who are interested in registering or acquiring domain names.
+
+# Import necessary libraries
+import time   # time for measuring startup and limiting how long each event loop tick spends on finished lookups
+PROCESS_START = time.perf_counter() # Taken before the other imports so the startup benchmark can include them.
+import tkinter as tk   # tkinter for creating and managing the GUI
+# whois (domain availability and WHOIS information), PIL (image resizing) and urllib (image downloads) are slow to import and
+# not needed to draw the first frame, so they are imported inside the functions that use them. LAZY_MODULES lists them for the startup benchmark.
+LAZY_MODULES = ('whois', 'PIL.Image', 'urllib.request')
+import io   # io for reading raw bytes data (used when loading images)
+import concurrent.futures   # concurrent.futures for running lookups and image downloads on worker threads
+import threading   # threading for running bulk checks away from the Tk thread and cancelling them
+import argparse   # argparse for the command-line options
+import functools   # functools for binding arguments to callbacks that run later on the Tk thread
+import queue   # queue for handing finished lookups from worker threads back to the Tk event loop
+import sys   # sys for the exit status and for starting the startup benchmark's child interpreters
+import collections   # collections for adding up the startup profile's timings
+import json   # json for passing startup benchmark timings between processes
+import os   # os for the image cache folder and file paths
+import base64   # base64 for handing cached PNG bytes to Tk's PhotoImage
+import hashlib   # hashlib for naming cached image files after their URL and size
+import contextlib   # contextlib for the timing context manager used by the startup profile
+import subprocess   # subprocess for running each startup benchmark in a fresh interpreter
+import tempfile   # tempfile for the throwaway caches and images used by the startup benchmark
+from tkinter import filedialog   # filedialog for choosing a file of domain names to bulk check
+from tkinter import ttk   # ttk for the table that shows WHOIS records
+from tkinter import messagebox   # messagebox for telling the user a watched domain has become available
+# The lookup logic lives in kwikaweb_core.py so the command line tool and HTTP service (kwikaweb_service.py) can use it without tkinter.
+# The command line comes from kwikaweb_cli.py rather than kwikaweb_service.py, so starting the GUI never imports http.server.
+from kwikaweb_core import CACHE_DIR, WHOIS_UNHEALTHY, BulkDomainChecker, TieredResolver, Watchlist, WhoisCache, WhoisRecord, describe_availability, export_metrics, export_records, export_results, generate_candidates, read_domain_file, read_domain_names, validate_domain
+from kwikaweb_cli import add_check_arguments, run_check
+
+ASSET_BASE_URL = "https://kwikaweb.com/wp-content/uploads/2023/07/" # Where the application's images are hosted.
+
+
+class StartupProfile: # Adds up how long each named startup step takes, across every thread, for the startup benchmark.
+    def __init__(self):
+        self.totals = collections.defaultdict(float) # step name -> total seconds spent in it
+        self.counts = collections.defaultdict(int) # step name -> number of times it ran
+        self.lock = threading.Lock() # Steps are timed on worker threads as well as the Tk thread.
+
+    @contextlib.contextmanager
+    def measure(self, name): # Times the body of a 'with' block and adds it to the named step.
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name, seconds): # Adds one timing to the named step.
+        with self.lock:
+            self.totals[name] += seconds
+            self.counts[name] += 1
+
+    def report(self): # Returns {step name: {'seconds': total, 'count': runs}}.
+        with self.lock:
+            return {name: {'seconds': self.totals[name], 'count': self.counts[name]} for name in self.totals}
+
+startup_profile = StartupProfile() # Shared profile filled in by the image loading code. Timing a step costs well under a microsecond.
+
+
+class AssetCache: # Disk cache of images that have already been downloaded and resized, stored as PNG bytes keyed by URL and size.
+    def __init__(self, folder=os.path.join(CACHE_DIR, 'assets')):
+        self.folder = folder # Folder holding one PNG file per (url, size).
+        os.makedirs(folder, exist_ok=True) # Make sure the cache folder exists.
+
+    def path_for(self, url, size): # Returns the file the image for this URL and size is cached in.
+        name = hashlib.sha256(f"{url}|{size}".encode('utf-8')).hexdigest()
+        return os.path.join(self.folder, name + '.png')
+
+    def load(self, url, size=None): # Returns the PNG bytes of the image at 'url' resized to 'size', downloading and resizing it only on a cache miss.
+        path = self.path_for(url, size)
+        try:
+            with startup_profile.measure('asset cache read'), open(path, 'rb') as cached:
+                return cached.read()
+        except FileNotFoundError:
+            pass # Not cached yet.
+        png_data = fetch_resized_image(url, size)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp" # Write to a temporary file first so a half-written image is never read.
+        with open(temp_path, 'wb') as cached:
+            cached.write(png_data)
+        os.replace(temp_path, path)
+        return png_data
+
+
+def fetch_resized_image(url, size=None): # Downloads an image, resizes it and returns it as PNG bytes.
+    import urllib.request # Imported here so startup does not pay for it; only needed when an image is not cached yet.
+    from PIL import Image
+    # First, we read the raw data from the URL
+    with startup_profile.measure('asset fetch'), urllib.request.urlopen(url) as u:
+        raw_data = u.read()
+    # Then, we open the image from the raw data and resize it
+    with startup_profile.measure('asset decode'):
+        im = Image.open(io.BytesIO(raw_data))
+        im.load()
+    if size is not None:
+        with startup_profile.measure('asset resize'):
+            im = im.resize(size, Image.BICUBIC)
+    # Finally, we save the resized image as PNG so Tk can display it without PIL
+    with startup_profile.measure('asset encode'):
+        output = io.BytesIO()
+        im.save(output, format='PNG')
+    return output.getvalue()
+
+
+class VirtualList(tk.Frame): # Scrollable list that only draws the rows in view. Rows are kept as plain data and turned into text as they scroll into view, so thousands of rows cost no extra widgets.
+    def __init__(self, parent, rows=None, format_row=str, height=15, width=500, row_height=18):
+        super().__init__(parent)
+        self.rows = [] if rows is None else rows # The data behind the list. Callers may append to it and then call refresh().
+        self.format_row = format_row # Turns one row into the text shown for it.
+        self.row_height = row_height # Pixels per row.
+        self.first = 0 # Index of the row at the top of the view.
+        self.follow = True # Keep the newest rows in view while the user has not scrolled up.
+        self.redraw_pending = False # True while a redraw is already scheduled.
+        self.canvas = tk.Canvas(self, width=width, height=height * row_height, background='white', highlightthickness=0) # The rows are drawn as text on this canvas.
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview) # The scrollbar drives 'first' directly; the canvas itself never scrolls.
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.items = [] # One canvas text item per visible row, reused as the list scrolls.
+        self.resize_pool(height)
+        self.canvas.bind('<Configure>', lambda event: self.resize_pool(event.height // row_height + 1)) # Grow or shrink the pool with the window.
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'): # Windows/macOS wheel events, then X11 ones.
+            self.canvas.bind(sequence, self.on_wheel)
+
+    def resize_pool(self, count): # Makes sure there is exactly one text item per row that fits in the view.
+        while len(self.items) < count:
+            self.items.append(self.canvas.create_text(4, len(self.items) * self.row_height + 2, anchor=tk.NW, text=''))
+        while len(self.items) > count:
+            self.canvas.delete(self.items.pop())
+        self.refresh()
+
+    def visible_count(self): # Number of rows that fit in the view.
+        return max(1, len(self.items) - 1) # The last pooled item is only partly in view.
+
+    def set_rows(self, rows): # Shows a new list of rows from the top.
+        self.rows = rows
+        self.first = 0
+        self.follow = True
+        self.refresh()
+
+    def refresh(self): # Schedules a redraw once pending events are handled, so many rows added in one tick cost a single redraw.
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.after_idle(self.redraw)
+
+    def redraw(self): # Puts the text of the rows in view into the pooled canvas items and updates the scrollbar.
+        self.redraw_pending = False
+        visible = self.visible_count()
+        if self.follow:
+            self.first = len(self.rows) - visible
+        self.first = max(0, min(self.first, len(self.rows) - visible))
+        for offset, item in enumerate(self.items):
+            index = self.first + offset
+            self.canvas.itemconfig(item, text=self.format_row(self.rows[index]) if index < len(self.rows) else '')
+        total = max(len(self.rows), 1)
+        self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
+
+    def yview(self, *args): # Scrollbar callback: ('moveto', fraction) or ('scroll', amount, 'units' or 'pages').
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.rows))
+        elif args[0] == 'scroll':
+            self.first += int(args[1]) * (self.visible_count() if args[2] == 'pages' else 1)
+        self.follow = self.first + self.visible_count() >= len(self.rows) # Scrolling back to the end resumes following new rows.
+        self.redraw()
+
+    def on_wheel(self, event): # Scrolls three rows per wheel notch.
+        self.yview('scroll', -3 if event.num == 4 or event.delta > 0 else 3, 'units')
+
+
+class DomainInfoGUI:
+    HEALTH_REFRESH_MS = 1000 # How often (in milliseconds) the WHOIS health window redraws while it is shown.
+    WATCH_WORKERS = 2 # Watchlist re-checks run at most this many at a time, in the background.
+    WATCH_POLL_MS = 60000 # Longest time (in milliseconds) between looks at the watchlist for domains that are due.
+    POLL_INTERVAL_MS = 15 # How often (in milliseconds) the Tk event loop picks up lookups that finished in the background.
+    FRAME_BUDGET = 0.008 # Most time (in seconds) each poll may spend updating the window, so it keeps redrawing smoothly during big runs.
+
+    def __init__(self, asset_base_url=ASSET_BASE_URL, cache=None, asset_cache=None):
+        # Initialize main application window
+        self.window = tk.Tk() # Creating an instance of Tk class which represents the main window
+        self.maximize_window(self.window) # Set the initial state of the window as zoomed/full-screen
+        self.window.title("Domain Name Search") # Set the title of the window
+
+        # WHOIS lookups and image downloads run on a pool of worker threads so the window never freezes while waiting on the network.
+        # Worker threads must not touch Tk widgets, so finished work is queued as callbacks and run by process_results on the Tk thread.
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=8) # Worker threads for single lookups and images.
+        self.watch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.WATCH_WORKERS) # Separate, smaller pool for watchlist re-checks, so hundreds of overdue names never hold up a lookup the user asked for.
+        self.ui_callbacks = queue.Queue() # Callbacks waiting to be run on the Tk thread.
+        self.pending_lookups = {} # Lookups still running, mapped to the domain name they are for.
+        self.bulk_cancel = None # Event used to stop the current bulk check, if one is running.
+        self.cache = cache or WhoisCache() # Shared on-disk cache so repeated lookups (even across restarts) skip the network.
+        self.resolver = TieredResolver() # Asks DNS first and WHOIS only when DNS cannot prove a name is taken.
+        self.check_availability = functools.partial(self.cache.cached_availability, check=self.resolver.is_domain_available) # Cache first, then DNS, then WHOIS.
+        self.asset_cache = asset_cache or AssetCache() # On-disk cache of downloaded and resized images, so they are only fetched once.
+        self.images = {} # PhotoImages already shown, keyed by (url, size), so reopening a window reuses them.
+        self.image_waiters = {} # Labels waiting on an image that is still loading, keyed by (url, size).
+        self.window.after(self.POLL_INTERVAL_MS, self.process_results) # Start polling for finished lookups.
+
+        # Load and display the application logo
+        self.logo_img_url = asset_base_url + "Kwikaweb-PNG.png" # URL of the logo image
+        self.logo_img_label = tk.Label(self.window) # Creating a label to hold the image
+        self.logo_img_label.pack(pady=10) # Displaying the label on the window with padding on the y-axis
+        self.load_image_lazily(self.logo_img_label, self.logo_img_url, (238, 40)) # Show a placeholder now and the logo once it has loaded in the background
+
+        # Create a menu bar in the application window
+        self.menu = tk.Menu(self.window) # Creating an instance of Menu class
+        self.window.config(menu=self.menu) # Adding the menu to the window
+
+        # Adding menu options with their respective command functions
+        self.menu.add_command(label="Domain Name Search", command=self.check_domain_availability) # 'Domain Name Search' menu option
+        self.menu.add_command(label="WHOIS Lookup", command=self.whois_lookup_window) # 'WHOIS Lookup' menu option
+        self.menu.add_command(label="Bulk Check", command=self.bulk_check_window) # 'Bulk Check' menu option
+        self.menu.add_command(label="Watchlist", command=self.watchlist_window) # 'Watchlist' menu option
+        self.menu.add_command(label="WHOIS Health", command=self.whois_health_window) # 'WHOIS Health' menu option
+
+        self.lbl_domain = tk.Label(self.window, text="Search for your Domain Name with ease:") # Creating a label widget for instructing the user.
+        self.lbl_domain.pack(pady=10) # Packing it into the window with some padding along the y-axis.
+
+        self.entry_domain = tk.Entry(self.window, width=30) # Creating an entry widget that will be used to capture user input. The domain name that the user wants to search for will be typed here.
+        self.entry_domain.pack(pady=5) # Packing it into the window with some padding along the y-axis.
+
+        self.btn_search = tk.Button(self.window, text="Search Availability", command=self.check_domain_availability) # Creating a search button. When clicked, it triggers the check_domain_availability function to verify the availability of the entered domain.
+        self.btn_search.pack(pady=10) # Packing it into the window with some padding along the y-axis.
+
+        self.btn_whois = tk.Button(self.window, text="WHOIS Lookup", command=self.whois_lookup_window) # Creating a WHOIS button. When clicked, it triggers the whois_lookup_window function to display a window where the WHOIS information of a domain can be viewed.
+        self.btn_whois.pack(pady=10) # Packing it into the window with some padding along the y-axis.
+
+        self.btn_bulk = tk.Button(self.window, text="Bulk Check", command=self.bulk_check_window) # Creating a bulk check button. When clicked, it triggers the bulk_check_window function to open a window where many domain names can be checked at once.
+        self.btn_bulk.pack(pady=10) # Packing it into the window with some padding along the y-axis.
+
+        self.btn_watchlist = tk.Button(self.window, text="Watchlist", command=self.watchlist_window) # Creating a watchlist button. When clicked, it triggers the watchlist_window function to show the domains being watched for expiry.
+        self.btn_watchlist.pack(pady=10) # Packing it into the window with some padding along the y-axis.
+
+        self.btn_health = tk.Button(self.window, text="WHOIS Health", command=self.whois_health_window) # Creating a WHOIS health button. When clicked, it triggers the whois_health_window function to show how quickly and reliably each WHOIS server is answering.
+        self.btn_health.pack(pady=10) # Packing it into the window with some padding along the y-axis.
+
+        self.lbl_status = tk.Label(self.window, text="") # Creating a label that shows which lookups are still running in the background.
+        self.lbl_status.pack(pady=5) # Packing it into the window with some padding along the y-axis.
+
+        self.btn_cancel = tk.Button(self.window, text="Cancel Lookups", command=self.cancel_lookups, state=tk.DISABLED) # Creating a cancel button. When clicked, it triggers the cancel_lookups function which abandons every lookup still running.
+        self.btn_cancel.pack(pady=5) # Packing it into the window with some padding along the y-axis.
+
+        self.btn_exit = tk.Button(self.window, text="Exit", command=self.exit_app) # Creating an exit button. When clicked, it triggers the exit_app function which closes the application.
+        self.btn_exit.pack(pady=10) # Packing it into the window with some padding along the y-axis.
+
+        self.main_window_img_url = asset_base_url + "Domain-Name-Registration-and-Transfer-Image.png" # Setting the URL of the main window image. The URL is where the image file is hosted online.
+        self.main_window_img_alt_text = "Domain Name Registration and Transfer Image" # Setting the alternative text for the main window image. This text is useful for accessibility and when the image cannot be loaded.
+        self.main_window_img_label = tk.Label(self.window) # Creating a label widget to display the fetched image in the GUI.
+        self.main_window_img_label.pack() # Packing the image label widget into the window.
+        self.load_image_lazily(self.main_window_img_label, self.main_window_img_url, (226, 195), alt_text=self.main_window_img_alt_text) # Calling the function 'load_image_lazily' so the window appears right away. The image is fetched, resized to 226x195 and cached in the background, and shown once it is ready.
+
+        self.bulk_window = None # Setting 'self.bulk_window' to None. The bulk check window is only created when the user asks for it.
+        self.bulk_results = [] # Results of the latest bulk check.
+        self.result_window = None # Setting 'self.result_window' to None. The availability result window is built the first time it is needed and reused after that.
+        self.watch_window = None # Setting 'self.watch_window' to None. The watchlist window is only created when the user asks for it.
+        self.health_window = None # Setting 'self.health_window' to None. The WHOIS health window is only created when the user asks for it.
+        self.health_after_id = None # The scheduled redraw of the WHOIS health window, if any.
+        self.watchlist = Watchlist() # Domains watched for expiry, with their re-checks queued by when they are due.
+        self.watch_after_id = self.window.after(1000, self.run_watch_cycle) # Start checking the watchlist shortly after startup.
+        self.asset_base_url = asset_base_url # Remembered for the images of windows opened later.
+        self.whois_window = None # Setting 'self.whois_window' to None. This is the initialization for the WHOIS lookup window which will be defined later in the program.
+
+        
+    def maximize_window(self, window): # This function maximizes a window. The 'zoomed' state only exists on Windows and macOS, so X11 uses the '-zoomed' attribute instead.
+        try:
+            window.state('zoomed')
+        except tk.TclError:
+            window.attributes('-zoomed', True)
+
+    def center_window(self, window): # This function is used to center a given window on the screen
+        window.update_idletasks() # First, we update the window's idle tasks to ensure we have the most recent size info
+        width = window.winfo_width() # Get the width of the window
+        height = window.winfo_height() # Get the height of the window
+        # Calculate the position to center the window
+        x = (window.winfo_screenwidth() // 2) - (width // 2)
+        y = (window.winfo_screenheight() // 2) - (height // 2)
+        window.geometry('{}x{}+{}+{}'.format(width, height, x, y)) # Set the geometry of the window to center it
+    
+    def run_in_background(self, func, domain_name, on_done): # Runs func(domain_name) on a worker thread and calls on_done(domain_name, future) on the Tk thread once it finishes.
+        future = self.executor.submit(func, domain_name)
+        self.pending_lookups[future] = domain_name # Remember the lookup so it can be shown as pending and cancelled.
+        # The done callback runs on the worker thread, so it only queues the real work for the Tk thread.
+        future.add_done_callback(lambda finished: self.ui_callbacks.put(functools.partial(self.finish_lookup, finished, on_done)))
+        self.update_pending_state()
+        return future
+
+    def finish_lookup(self, future, on_done): # Runs on the Tk thread when a background lookup finishes.
+        domain_name = self.pending_lookups.pop(future, None)
+        if domain_name is None:
+            return # The lookup was cancelled, so its result is thrown away.
+        self.update_pending_state()
+        on_done(domain_name, future)
+
+    def process_results(self): # Runs queued callbacks on the Tk thread, stopping once the frame budget is used up so the window stays responsive.
+        deadline = time.perf_counter() + self.FRAME_BUDGET
+        while time.perf_counter() < deadline:
+            try:
+                callback = self.ui_callbacks.get_nowait()
+            except queue.Empty:
+                break # Nothing else has finished yet.
+            callback()
+        self.window.after(self.POLL_INTERVAL_MS, self.process_results) # Check again on the next tick.
+
+    def update_pending_state(self): # Shows which lookups are still running and enables the cancel buttons while there are any.
+        if self.pending_lookups:
+            names = list(self.pending_lookups.values())
+            text = f"Looking up {', '.join(names[:3])}" + (f" and {len(names) - 3} more" if len(names) > 3 else "") + "..."
+            state = tk.NORMAL
+        else:
+            text = ""
+            state = tk.DISABLED
+        self.lbl_status.config(text=text)
+        self.btn_cancel.config(state=state)
+        if self.whois_window is not None:
+            self.whois_lbl_status.config(text=text)
+            self.whois_btn_cancel.config(state=state)
+
+    def cancel_lookups(self): # Abandons every single lookup still running. Queued lookups are dropped; ones already talking to a server finish but their results are ignored.
+        for future in self.pending_lookups:
+            future.cancel()
+        self.pending_lookups.clear()
+        self.update_pending_state()
+
+    def check_domain_availability(self): # This method starts an availability check for the entered domain in the background. The result window opens when it finishes.
+        domain_name = self.entry_domain.get() # Retrieving the domain name from the entry widget.
+        self.run_in_background(self.is_domain_available, domain_name, self.show_availability) # Check the domain on a worker thread so the window stays responsive.
+
+    def show_availability(self, domain_name, future): # This method shows the result of an availability check in the result window.
+        error = future.exception() # The lookup may have failed, for example because the WHOIS server could not be reached.
+        message = describe_availability(domain_name, None if error else future.result(), error) # Build the message telling the user whether the domain is available.
+
+        if self.result_window is None:
+            self.result_window = tk.Toplevel(self.window) # Create the toplevel window that shows result messages. It is reused for every later result.
+            self.result_window.geometry('300x100') # Set the size of the result window.
+            self.result_window.protocol("WM_DELETE_WINDOW", self.result_window.withdraw) # Closing the window only hides it, so it can be shown again.
+            self.result_label = tk.Label(self.result_window, wraplength=280) # Create a label for the message text and add it to the result window.
+            self.result_label.pack(pady=10) # Pack the label with a padding in the y direction.
+
+            btn_back = tk.Button(self.result_window, text="Back To Search", command=self.result_window.withdraw) # Create a button for going back to the search. When this button is pressed, the result window is hidden.
+            btn_back.pack(pady=10) # Pack the button with a padding in the y direction.
+
+        self.result_label.config(text=message) # Update the message in place.
+        self.result_window.deiconify() # Show the window again if it was hidden.
+        self.center_window(self.result_window) # Center the result window on the screen.
+        self.result_window.lift() # Bring it in front of the main window.
+
+    # This method checks if a domain is available. It validates the name, then answers from the cache, the DNS tier or WHOIS, in that order.
+    # It returns True if the domain is available and False if it is registered. It raises ValueError for a name that could
+    # never be registered and WhoisLookupError when WHOIS could not tell, instead of reporting either one as available.
+    def is_domain_available(self, domain_name):
+        ascii_name = validate_domain(domain_name) # Trimmed, lowercased and in punycode, the only form DNS and WHOIS understand.
+        if ascii_name is None:
+            raise ValueError("not a valid domain name") # Never spend a query on a name that cannot exist.
+        return self.check_availability(ascii_name) # Answer from the cache when possible, otherwise ask DNS or WHOIS and remember the answer.
+
+    def bulk_check_window(self): # This method shows a window where a list of domain names can be checked all at once. It is built the first time and reused afterwards.
+        if self.bulk_window is not None:
+            self.bulk_window.deiconify() # The bulk window was built before, so just show it again.
+            self.bulk_window.lift() # Bring it to the front.
+            return
+
+        self.bulk_window = tk.Toplevel(self.window) # Create a new toplevel window for bulk checking.
+        self.bulk_window.title("Bulk Domain Check") # Set the title of the bulk check window.
+
+        self.bulk_lbl_domains = tk.Label(self.bulk_window, text="Enter one domain name per line, or load them from a file:") # Create a label explaining how to enter the domain names.
+        self.bulk_lbl_domains.pack(pady=10) # Add the label to the window with padding in the y direction.
+
+        self.bulk_txt_domains = tk.Text(self.bulk_window, height=10, width=50) # Create a text box where the domain names are typed or loaded.
+        self.bulk_txt_domains.pack(pady=5) # Add the text box to the window with padding in the y direction.
+
+        self.bulk_btn_load = tk.Button(self.bulk_window, text="Load File", command=self.load_bulk_file) # Create a button to load domain names from a text file.
+        self.bulk_btn_load.pack(pady=5) # Add the button to the window with padding in the y direction.
+
+        self.bulk_btn_check = tk.Button(self.bulk_window, text="Check All", command=self.run_bulk_check) # Create a button to start checking every domain in the list.
+        self.bulk_btn_check.pack(pady=5) # Add the button to the window with padding in the y direction.
+
+        self.bulk_lbl_generate = tk.Label(self.bulk_window, text="Or generate names from comma-separated keywords, TLDs, prefixes and suffixes:") # Create a label explaining the name generator.
+        self.bulk_lbl_generate.pack(pady=10) # Add the label to the window with padding in the y direction.
+
+        self.bulk_frame_generate = tk.Frame(self.bulk_window) # Create a frame that lines up the generator fields in a grid.
+        self.bulk_frame_generate.pack(pady=5) # Add the frame to the window with padding in the y direction.
+        self.bulk_entries_generate = {} # The generator entry fields, keyed by what they hold.
+        for row, (name, default) in enumerate([("Keywords", ""), ("TLDs", "com, net, org"), ("Prefixes", ""), ("Suffixes", "")]):
+            tk.Label(self.bulk_frame_generate, text=name + ":").grid(row=row, column=0, sticky=tk.E, padx=5) # Label each field.
+            entry = tk.Entry(self.bulk_frame_generate, width=40) # Create the entry field itself.
+            entry.insert(0, default) # Fill in a sensible default.
+            entry.grid(row=row, column=1, pady=2)
+            self.bulk_entries_generate[name] = entry
+
+        self.bulk_btn_generate = tk.Button(self.bulk_window, text="Generate and Check", command=self.run_generated_check) # Create a button to check every generated name.
+        self.bulk_btn_generate.pack(pady=5) # Add the button to the window with padding in the y direction.
+
+        self.bulk_btn_cancel = tk.Button(self.bulk_window, text="Cancel", command=self.cancel_bulk_check, state=tk.DISABLED) # Create a button to stop a bulk check that is running.
+        self.bulk_btn_cancel.pack(pady=5) # Add the button to the window with padding in the y direction.
+
+        self.bulk_lbl_status = tk.Label(self.bulk_window, text="") # Create a label that shows how far along the bulk check is.
+        self.bulk_lbl_status.pack(pady=5) # Add the label to the window with padding in the y direction.
+
+        self.bulk_lbl_tiers = tk.Label(self.bulk_window, text="") # Create a label that shows how many lookups DNS settled without asking WHOIS.
+        self.bulk_lbl_tiers.pack(pady=5) # Add the label to the window with padding in the y direction.
+
+        self.bulk_list_results = VirtualList(self.bulk_window, rows=self.bulk_results, format_row=lambda result: describe_availability(*result)) # Create a list where each result is added as soon as it finishes. Only the rows in view are drawn, so thousands of results stay fast.
+        self.bulk_list_results.pack(pady=5, fill=tk.BOTH, expand=True) # Add the list to the window with padding in the y direction.
+
+        self.bulk_btn_export = tk.Button(self.bulk_window, text="Export Results", command=lambda: self.export_to_file(self.bulk_results, export_results, self.bulk_window)) # Create a button to save the results as CSV or JSON Lines.
+        self.bulk_btn_export.pack(pady=5) # Add the button to the window with padding in the y direction.
+
+        btn_back = tk.Button(self.bulk_window, text="Back To Search", command=self.close_bulk_window) # Create a button to close the bulk check window.
+        btn_back.pack(pady=10) # Add the button to the window with padding in the y direction.
+        self.bulk_window.protocol("WM_DELETE_WINDOW", self.close_bulk_window) # Closing the window with the title bar also stops the bulk check.
+
+        self.center_window(self.bulk_window) # Center the bulk check window on the screen.
+
+    def load_bulk_file(self): # This method asks for a text file of domain names and puts its contents in the bulk check text box.
+        path = filedialog.askopenfilename(parent=self.bulk_window, title="Choose a file of domain names", filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
+        if not path:
+            return # The user cancelled the file dialog.
+        self.bulk_txt_domains.delete('1.0', tk.END) # Replace whatever was in the text box with the file's contents.
+        self.bulk_txt_domains.insert(tk.END, '\n'.join(read_domain_file(path)))
+
+    def run_bulk_check(self): # This method starts checking every domain in the bulk text box in the background.
+        domain_names = list(read_domain_names(self.bulk_txt_domains.get('1.0', tk.END).splitlines())) # Collect the domain names from the text box.
+        self.start_bulk_check(domain_names, len(domain_names))
+
+    def run_generated_check(self): # This method starts checking every name generated from the keyword, TLD, prefix and suffix fields.
+        fields = {name: [part for part in entry.get().split(',') if part.strip()] for name, entry in self.bulk_entries_generate.items()} # Split each field on commas.
+        candidates = generate_candidates(fields["Keywords"], fields["TLDs"], [''] + fields["Prefixes"], [''] + fields["Suffixes"]) # Names are generated lazily on the worker thread.
+        self.start_bulk_check(candidates, None) # The number of names is not known until they have all been generated.
+
+    def start_bulk_check(self, domain_names, total): # This method starts a bulk check of 'domain_names' (any iterable) in the background. 'total' is the number of names, if known.
+        self.cancel_bulk_check() # Only one bulk check runs at a time, so stop any previous one.
+        self.bulk_results = [] # (domain_name, availability, error) tuples of this run, shown in the results list and kept for exporting.
+        self.bulk_list_results.set_rows(self.bulk_results) # Clear the results of any previous run.
+        self.bulk_cancel = threading.Event() # Setting this event stops the new run.
+        self.bulk_total = total # Number of domains in this run (None if unknown), used for the progress message.
+        self.bulk_checked = 0 # Number of domains checked so far.
+        self.bulk_lbl_status.config(text="Checking domains...") # Show a pending state until the first result arrives.
+        self.bulk_btn_cancel.config(state=tk.NORMAL) # The run can now be cancelled.
+        threading.Thread(target=self.bulk_check_worker, args=(domain_names, self.bulk_cancel), daemon=True).start() # Run the checks away from the Tk thread.
+
+    def bulk_check_worker(self, domain_names, cancel_event): # Runs on a background thread and queues each bulk result for the Tk thread as it finishes.
+        results = BulkDomainChecker(check=self.check_availability).check_many(domain_names)
+        try:
+            for result in results:
+                if cancel_event.is_set():
+                    break # The run was cancelled, so stop handing out results.
+                self.ui_callbacks.put(functools.partial(self.show_bulk_result, cancel_event, result))
+        finally:
+            results.close() # Drop the checks that have not started yet.
+            self.ui_callbacks.put(functools.partial(self.finish_bulk_check, cancel_event))
+
+    def show_bulk_result(self, cancel_event, result): # Adds one finished bulk result to the results list. Runs on the Tk thread.
+        if cancel_event is not self.bulk_cancel or cancel_event.is_set():
+            return # The result belongs to a run that was cancelled.
+        self.bulk_checked += 1
+        self.bulk_results.append(result) # Keep the result; the results list shows it on its next redraw.
+        self.bulk_list_results.refresh()
+        self.bulk_lbl_status.config(text=self.bulk_progress("Checked")) # Show the progress.
+        self.bulk_lbl_tiers.config(text=self.resolver.describe_hit_rates()) # Show how much WHOIS traffic DNS has saved.
+
+    def finish_bulk_check(self, cancel_event): # Resets the bulk window once a run has stopped. Runs on the Tk thread.
+        if cancel_event is not self.bulk_cancel:
+            return # A newer run has already started.
+        self.bulk_cancel = None
+        if self.bulk_window is not None:
+            self.bulk_btn_cancel.config(state=tk.DISABLED)
+            if cancel_event.is_set():
+                self.bulk_lbl_status.config(text=self.bulk_progress("Cancelled after"))
+
+    def bulk_progress(self, verb): # Describes how many domains the bulk check has got through, e.g. "Checked 3 of 10 domains".
+        if self.bulk_total is None:
+            return f"{verb} {self.bulk_checked} domains"
+        return f"{verb} {self.bulk_checked} of {self.bulk_total} domains"
+
+    def cancel_bulk_check(self): # Stops the running bulk check. Checks already talking to a WHOIS server finish, but their results are ignored.
+        if self.bulk_cancel is not None:
+            self.bulk_cancel.set()
+            self.finish_bulk_check(self.bulk_cancel)
+
+    def close_bulk_window(self): # Stops any running bulk check and hides the bulk check window until it is needed again.
+        self.cancel_bulk_check()
+        self.bulk_window.withdraw()
+
+    def whois_lookup_window(self): # This method shows the WHOIS lookup window. It is built the first time and reused afterwards, results included.
+        if self.whois_window is not None:
+            self.whois_window.deiconify() # The window was built before, so just show it again.
+            self.maximize_window(self.whois_window)
+            self.whois_window.lift()
+            return
+
+        self.whois_window = tk.Toplevel(self.window) # Create a new toplevel window for WHOIS lookup.
+        self.whois_window.title("WHOIS Lookup") # Set the title of the WHOIS window.
+        self.maximize_window(self.whois_window) # Maximize the WHOIS window.
+        self.whois_window.protocol("WM_DELETE_WINDOW", self.back_to_main_window) # Closing the window only hides it, so it can be shown again.
+
+        self.whois_logo_img_label = tk.Label(self.whois_window) # Create a label for the logo image and add it to the WHOIS window.
+        self.whois_logo_img_label.pack(pady=10) # Add the label to the window with padding in the y direction.
+        self.load_image_lazily(self.whois_logo_img_label, self.logo_img_url, (238, 40)) # The logo was already loaded for the main window, so this reuses it.
+
+        self.whois_menu = tk.Menu(self.whois_window) # Create a menu for the WHOIS window.
+        self.whois_window.config(menu=self.whois_menu) # Set the menu of the WHOIS window.
+        
+        # Add commands to the WHOIS window menu.
+        self.whois_menu.add_command(label="Domain Name Search", command=self.back_to_main_window) # Go back to the main window for domain name search.
+        self.whois_menu.add_command(label="WHOIS Lookup", command=self.whois_lookup_window) # Bring the WHOIS lookup window to the front.
+
+        self.whois_lbl_domain = tk.Label(self.whois_window, text="Enter Domain Name") # Create a label prompting the user to enter a domain name.
+        self.whois_lbl_domain.pack(pady=10) # Add the label to the window with padding in the y direction.
+
+        self.whois_entry_domain = tk.Entry(self.whois_window, width=30) # Create an entry field for the user to enter a domain name.
+        self.whois_entry_domain.pack(pady=5) # Add the entry field to the window with padding in the y direction.
+
+        self.whois_btn_search = tk.Button(self.whois_window, text="Get WHOIS Information", command=self.get_whois_info) # Create a button to initiate the WHOIS lookup.
+        self.whois_btn_search.pack(pady=10) # Add the button to the window with padding in the y direction.
+
+        self.whois_lbl_status = tk.Label(self.whois_window, text="") # Create a label that shows which lookups are still running in the background.
+        self.whois_lbl_status.pack(pady=5) # Add the label to the window with padding in the y direction.
+
+        self.whois_btn_cancel = tk.Button(self.whois_window, text="Cancel Lookups", command=self.cancel_lookups, state=tk.DISABLED) # Create a button to abandon every lookup still running.
+        self.whois_btn_cancel.pack(pady=5) # Add the button to the window with padding in the y direction.
+
+        # Results pane. Every lookup updates these widgets in place instead of opening a new window.
+        self.whois_record = None # The record currently shown, used by the Export and Watch buttons.
+        self.whois_lbl_result = tk.Label(self.whois_window, text="", wraplength=450) # Create a label naming the domain shown, or the error if the lookup failed.
+        self.whois_lbl_result.pack(pady=5) # Add the label to the window with padding in the y direction.
+
+        self.whois_table = ttk.Treeview(self.whois_window, columns=("field", "value"), show="headings", height=6) # Create a table to display the WHOIS information.
+        self.whois_table.heading("field", text="Field") # Name the columns.
+        self.whois_table.heading("value", text="Value")
+        self.whois_table.column("field", width=110, anchor=tk.W) # The labels are short, so the values get most of the room.
+        self.whois_table.column("value", width=360, anchor=tk.W)
+        self.whois_table_rows = [self.whois_table.insert('', tk.END, values=(label, "")) for label, value in WhoisRecord('').table_rows()] # One row per field, created once and refilled for every lookup.
+        self.whois_table.pack(pady=5) # Add the table to the window with padding in the y direction.
+
+        self.whois_frame_actions = tk.Frame(self.whois_window) # Create a frame to hold the result buttons side by side.
+        self.whois_frame_actions.pack(pady=5) # Add the frame to the window with padding in the y direction.
+        self.whois_btn_export = tk.Button(self.whois_frame_actions, text="Export", state=tk.DISABLED, command=lambda: self.export_to_file([self.whois_record], export_records, self.whois_window)) # Create a button to save the record as CSV or JSON Lines.
+        self.whois_btn_export.pack(side=tk.LEFT, padx=5)
+        self.whois_btn_watch = tk.Button(self.whois_frame_actions, text="Watch This Domain", state=tk.DISABLED, command=lambda: self.watch_domain(self.whois_record.domain, self.whois_record)) # Create a button to add the domain to the watchlist.
+        self.whois_btn_watch.pack(side=tk.LEFT, padx=5)
+
+        self.whois_btn_back = tk.Button(self.whois_window, text="Domain Name Search", command=self.back_to_main_window) # Create a button to go back to the domain name search.
+        self.whois_btn_back.pack(pady=10) # Add the button to the window with padding in the y direction.
+
+        self.whois_btn_exit = tk.Button(self.whois_window, text="Exit", command=self.exit_app) # Create a button to exit the application.
+        self.whois_btn_exit.pack(pady=10) # Add the button to the window with padding in the y direction.
+
+        self.whois_window_img_url = self.asset_base_url + "Domain-Name-Registration-Image.png" # Define the URL of the image to be loaded for the WHOIS lookup window.
+        self.whois_window_img_alt_text = "WHOIS Lookup Image" # Set an alternate text for the image. This is typically used for accessibility purposes.
+        self.whois_window_img_label = tk.Label(self.whois_window) # Create a Tkinter Label widget for the image and assign this label to the 'whois_window_img_label' attribute.
+        self.whois_window_img_label.pack() # Pack (position) the label widget in the window with default settings (centered alignment).
+        self.load_image_lazily(self.whois_window_img_label, self.whois_window_img_url, (226, 195), alt_text=self.whois_window_img_alt_text)  # Use the helper function load_image_lazily() to show the image resized to (226, 195). It comes from memory or the disk cache when it was loaded before.
+
+        self.update_pending_state() # Show any lookups that are already running.
+
+    def get_whois_info(self): # This method starts retrieving WHOIS information for a given domain in the background.
+        domain_name = self.whois_entry_domain.get() # Get the domain name from the entry field.
+        self.run_in_background(self.lookup_whois, domain_name, self.show_whois_info) # Retrieve the WHOIS information on a worker thread so the window stays responsive.
+
+    def lookup_whois(self, domain_name): # Returns the WhoisRecord of a domain, or None if it is not registered. Runs on a worker thread.
+        ascii_name = validate_domain(domain_name)
+        if ascii_name is None:
+            raise ValueError("not a valid domain name") # Never spend a query on a name that cannot exist.
+        return self.cache.cached_whois(ascii_name, lookup=self.resolver.lookup_record) # The query is timed and limited like every other one.
+
+    def show_whois_info(self, domain_name, future): # This method shows the WHOIS information in the results pane of the WHOIS window once the lookup finishes.
+        error = future.exception() # The lookup may have failed, for example because the WHOIS server could not be reached.
+        self.whois_record = None if error else future.result() # The WhoisRecord for the domain, or None if it is not registered.
+        if error:
+            self.whois_lbl_result.config(text=f"The WHOIS lookup of {domain_name} failed: {error}") # Show the error instead of the information if the lookup failed.
+            rows = [(label, "") for label, value in WhoisRecord('').table_rows()]
+        elif self.whois_record is None:
+            self.whois_lbl_result.config(text=f"{domain_name} is not registered, so there is no WHOIS information.")
+            rows = [(label, "") for label, value in WhoisRecord('').table_rows()]
+        else:
+            self.whois_lbl_result.config(text="WHOIS information of " + domain_name + ": ") # Name the domain shown.
+            rows = self.whois_record.table_rows()
+        for row_id, row in zip(self.whois_table_rows, rows):
+            self.whois_table.item(row_id, values=row) # Refill the existing rows in place.
+        state = tk.NORMAL if self.whois_record else tk.DISABLED # Export and Watch only make sense for a record.
+        self.whois_btn_export.config(state=state)
+        self.whois_btn_watch.config(state=state)
+
+    def export_to_file(self, items, export, parent, filetypes=(("CSV files", "*.csv"), ("JSON Lines files", "*.jsonl"))): # This method asks where to save and writes 'items' there with the given export function (the format follows the file extension).
+        path = filedialog.asksaveasfilename(parent=parent, title="Export", defaultextension=".csv", filetypes=list(filetypes))
+        if path:
+            export(items, path)
+
+    def watchlist_window(self): # This method shows a window listing the watched domains, where domains can be added and removed.
+        if self.watch_window is not None:
+            self.watch_window.deiconify() # The watchlist window was built before, so just show it again.
+            self.watch_window.lift() # Bring it to the front.
+            self.refresh_watchlist() # Catch up on checks that finished while it was hidden.
+            return
+
+        self.watch_window = tk.Toplevel(self.window) # Create a new toplevel window for the watchlist.
+        self.watch_window.title("Expiry Watchlist") # Set the title of the watchlist window.
+        self.watch_window.protocol("WM_DELETE_WINDOW", self.watch_window.withdraw) # Closing the window only hides it, so it can be shown again.
+
+        lbl_watch = tk.Label(self.watch_window, text="Watch a domain and be told when it becomes available:") # Create a label explaining the watchlist.
+        lbl_watch.pack(pady=10) # Add the label to the window with padding in the y direction.
+
+        self.watch_entry_domain = tk.Entry(self.watch_window, width=30) # Create an entry field for the domain name to watch.
+        self.watch_entry_domain.pack(pady=5) # Add the entry field to the window with padding in the y direction.
+
+        btn_add = tk.Button(self.watch_window, text="Watch", command=lambda: self.watch_domain(self.watch_entry_domain.get())) # Create a button to start watching the entered domain.
+        btn_add.pack(pady=5) # Add the button to the window with padding in the y direction.
+
+        self.watch_list_domains = tk.Listbox(self.watch_window, height=15, width=80) # Create a list box showing each watched domain, its status and its next check.
+        self.watch_list_domains.pack(pady=5) # Add the list box to the window with padding in the y direction.
+
+        btn_remove = tk.Button(self.watch_window, text="Stop Watching", command=self.unwatch_selected) # Create a button to stop watching the selected domain.
+        btn_remove.pack(pady=5) # Add the button to the window with padding in the y direction.
+
+        btn_back = tk.Button(self.watch_window, text="Back To Search", command=self.watch_window.withdraw) # Create a button to hide the watchlist window.
+        btn_back.pack(pady=10) # Add the button to the window with padding in the y direction.
+
+        self.refresh_watchlist() # Fill in the list box.
+        self.center_window(self.watch_window) # Center the watchlist window on the screen.
+
+    def refresh_watchlist(self): # This method redraws the watchlist list box, soonest check first, if the window is open.
+        if self.watch_window is None or self.watch_window.state() == 'withdrawn':
+            return # Nothing to redraw while the window is hidden.
+        self.watch_list_domains.delete(0, tk.END)
+        for domain_name in sorted(self.watchlist.entries, key=lambda name: self.watchlist.entries[name]['next_check']):
+            self.watch_list_domains.insert(tk.END, self.watchlist.describe(domain_name))
+
+    def watch_domain(self, domain_name, record=None): # This method starts watching a domain. With a fresh WhoisRecord it is scheduled straight away; otherwise it is checked on the next cycle.
+        if validate_domain(domain_name) is None:
+            messagebox.showerror("Watchlist", f"'{domain_name}' is not a valid domain name.", parent=self.watch_window or self.window)
+            return
+        domain_name = self.watchlist.add(domain_name)
+        if record is not None:
+            self.watchlist.record_result(domain_name, record) # Reschedule from the record we already have; the queued immediate check becomes stale and is skipped.
+        self.refresh_watchlist()
+        self.window.after_cancel(self.watch_after_id) # Run a cycle now rather than waiting for the next one.
+        self.run_watch_cycle()
+
+    def unwatch_selected(self): # This method stops watching the domain selected in the watchlist window.
+        selection = self.watch_list_domains.curselection()
+        if selection:
+            self.watchlist.remove(self.watch_list_domains.get(selection[0]).split(':', 1)[0])
+            self.refresh_watchlist()
+
+    def run_watch_cycle(self): # This method re-checks only the watched domains that are due, then sleeps until the next one is (or a minute, whichever is sooner).
+        for domain_name in self.watchlist.due():
+            future = self.watch_executor.submit(self.refresh_watched_domain, domain_name) # Query WHOIS on the watchlist's own worker threads.
+            future.add_done_callback(lambda finished, name=domain_name: self.ui_callbacks.put(functools.partial(self.finish_watch_check, name, finished)))
+        next_due = self.watchlist.next_due()
+        delay = self.WATCH_POLL_MS if next_due is None else min(self.WATCH_POLL_MS, max(0, int((next_due - time.time()) * 1000)))
+        self.watch_after_id = self.window.after(delay, self.run_watch_cycle)
+
+    def refresh_watched_domain(self, domain_name): # Fetches a fresh WhoisRecord for a watched domain, skipping the cache. Runs on a worker thread.
+        record = self.resolver.lookup_record(domain_name)
+        self.cache.store_record(domain_name, record) # Keep the cache up to date while we are at it.
+        return record
+
+    def finish_watch_check(self, domain_name, future): # Stores the result of a watchlist check and tells the user if the domain has become available. Runs on the Tk thread.
+        error = future.exception()
+        became_available = self.watchlist.record_result(domain_name, None if error else future.result(), error)
+        self.refresh_watchlist()
+        if became_available:
+            self.window.bell() # Get the user's attention.
+            messagebox.showinfo("Watched Domain Available", f"The watched domain '{domain_name}' is now available!", parent=self.window)
+
+    def whois_health_window(self): # This method shows a table of every WHOIS server queried so far: its circuit state, latencies, errors and timeout.
+        if self.health_window is not None:
+            self.health_window.deiconify() # The health window was built before, so just show it again.
+            self.health_window.lift() # Bring it to the front.
+            self.refresh_health() # Start redrawing it again.
+            return
+
+        self.health_window = tk.Toplevel(self.window) # Create a new toplevel window for the WHOIS health panel.
+        self.health_window.title("WHOIS Health") # Set the title of the health window.
+        self.health_window.protocol("WM_DELETE_WINDOW", self.health_window.withdraw) # Closing the window only hides it, so it can be shown again.
+
+        lbl_health = tk.Label(self.health_window, text="How each WHOIS server has answered so far. Servers whose circuit is open are skipped until they recover.") # Create a label explaining the table.
+        lbl_health.pack(pady=10) # Add the label to the window with padding in the y direction.
+
+        columns = ("server", "tlds", "state", "queries", "failed", "timeouts", "retries", "p50", "p95", "timeout") # Columns of the health table.
+        headings = ("Server", "TLDs", "Circuit", "Queries", "Failed", "Timed Out", "Retried", "p50", "p95", "Timeout") # Column titles, in the same order.
+        self.health_table = ttk.Treeview(self.health_window, columns=columns, show="headings", height=12) # Create a table with one row per WHOIS server.
+        for column, heading in zip(columns, headings):
+            self.health_table.heading(column, text=heading) # Name the columns.
+            self.health_table.column(column, width=180 if column == "server" else 75, anchor=tk.W)
+        self.health_table.pack(pady=5, padx=10) # Add the table to the window with padding.
+        self.health_rows = {} # Server host name -> table row id, so rows are updated in place on every refresh.
+
+        self.health_lbl_tiers = tk.Label(self.health_window, text="") # Create a label summing up the DNS and WHOIS tiers.
+        self.health_lbl_tiers.pack(pady=5) # Add the label to the window with padding in the y direction.
+
+        btn_export = tk.Button(self.health_window, text="Export Metrics", command=lambda: self.export_to_file(self.resolver.monitor, export_metrics, self.health_window, (("CSV files", "*.csv"), ("JSON files", "*.json")))) # Create a button to save every metric, histograms included, as CSV or JSON.
+        btn_export.pack(pady=5) # Add the button to the window with padding in the y direction.
+
+        btn_back = tk.Button(self.health_window, text="Back To Search", command=self.health_window.withdraw) # Create a button to hide the health window.
+        btn_back.pack(pady=10) # Add the button to the window with padding in the y direction.
+
+        self.center_window(self.health_window) # Center the health window on the screen.
+        self.refresh_health() # Fill in the table and keep it up to date.
+
+    def refresh_health(self): # This method redraws the WHOIS health table and schedules the next redraw, for as long as the window is shown.
+        if self.health_after_id is not None:
+            self.health_window.after_cancel(self.health_after_id) # Never keep two redraw loops going.
+            self.health_after_id = None
+        if self.health_window is None or self.health_window.state() == 'withdrawn':
+            return # Stop redrawing while the window is hidden; showing it again restarts the loop.
+        def seconds(value): # Formats a latency or timeout for the table.
+            return "-" if value is None else f"{value:g}s"
+        for server in self.resolver.monitor.snapshot()['servers']:
+            state = server['state'] if server['state'] != 'open' else f"open ({server['opens in']:.0f}s)"
+            values = (server['server'], ', '.join(server['tlds']), state, server['queries'], sum(server['outcomes'][category] for category in WHOIS_UNHEALTHY), server['outcomes']['timeout'], server['retries'], seconds(server['p50']), seconds(server['p95']), f"{server['timeout']:.1f}s")
+            if server['server'] in self.health_rows:
+                self.health_table.item(self.health_rows[server['server']], values=values)
+            else:
+                self.health_rows[server['server']] = self.health_table.insert('', tk.END, values=values)
+        self.health_lbl_tiers.config(text=self.resolver.describe_hit_rates())
+        self.health_after_id = self.health_window.after(self.HEALTH_REFRESH_MS, self.refresh_health)
+
+    def exit_app(self): # This method closes the main application window.
+        self.cancel_lookups() # Throw away any lookups that are still running.
+        if self.bulk_cancel is not None:
+            self.bulk_cancel.set() # Stop the bulk check, if one is running.
+        self.executor.shutdown(wait=False, cancel_futures=True) # Drop queued lookups without waiting for the ones already in flight.
+        self.watch_executor.shutdown(wait=False, cancel_futures=True) # The same for queued watchlist re-checks; unchecked names are still due next time.
+        self.cache.close() # Close the on-disk cache.
+        self.window.destroy() # Destroy the main application window.
+
+    def back_to_main_window(self): # This method hides the WHOIS lookup window and goes back to the main window.
+        self.whois_window.withdraw() # Hide the WHOIS lookup window; it is shown again, as it was, the next time it is needed.
+        
+    # Function to show an image from a URL in a label without blocking the window.
+    # The label gets a blank placeholder of the right size straight away; the image is fetched (or read from the asset cache)
+    # on a worker thread and swapped in once it is ready. Images already shown once are reused from memory.
+    def load_image_lazily(self, label, url, size, alt_text=None):
+        key = (url, size)
+        if key in self.images:
+            label.config(image=self.images[key]) # Already loaded, so show it immediately.
+            return
+        label.config(image=self.placeholder_image(size)) # Keep the layout steady until the real image arrives.
+        if key in self.image_waiters:
+            self.image_waiters[key].append((label, alt_text)) # The image is already being loaded for another label.
+            return
+        self.image_waiters[key] = [(label, alt_text)]
+        future = self.executor.submit(self.asset_cache.load, url, size)
+        future.add_done_callback(lambda finished: self.ui_callbacks.put(functools.partial(self.show_loaded_image, key, finished)))
+
+    def show_loaded_image(self, key, future): # Puts a freshly loaded image into every label waiting for it. Runs on the Tk thread.
+        waiters = self.image_waiters.pop(key, [])
+        error = future.exception() # The download may have failed, for example when offline.
+        if error is None:
+            image = self.images[key] = self.make_photo_image(future.result(), alt_text=waiters[0][1] if waiters else None)
+        for label, alt_text in waiters:
+            if not label.winfo_exists():
+                continue # The label's window was closed while the image loaded.
+            if error is None:
+                label.config(image=image)
+            else:
+                label.config(image='', text=alt_text or "") # Fall back to the alternative text if the image cannot be loaded.
+
+    def placeholder_image(self, size): # Returns a blank image of the given size, shared by every placeholder of that size.
+        key = ('placeholder', size)
+        if key not in self.images:
+            self.images[key] = tk.PhotoImage(width=size[0], height=size[1])
+        return self.images[key]
+
+    def make_photo_image(self, png_data, alt_text=None): # Turns cached PNG bytes into a PhotoImage. Must run on the Tk thread.
+        with startup_profile.measure('photo image'):
+            image = tk.PhotoImage(data=base64.b64encode(png_data))
+        if alt_text is not None:
+            image.alt = alt_text
+        return image
+
+    # Function to fetch an image from a URL (through the asset cache) and convert it to a PhotoImage after resizing.
+    # This blocks until the image is ready; the windows use load_image_lazily instead.
+    def load_image_from_url(self, url, size=None, alt_text=None):
+        return self.make_photo_image(self.asset_cache.load(url, size), alt_text=alt_text)
+
+BENCHMARK_IMAGES = {"Kwikaweb-PNG.png": (952, 160), "Domain-Name-Registration-and-Transfer-Image.png": (904, 780), "Domain-Name-Registration-Image.png": (904, 780)} # Stand-ins for the hosted images, at roughly their real sizes.
+
+
+def run_startup_benchmark(asset_base_url, cache_folder): # Starts the GUI once, measures each startup step and prints the timings as one JSON line. Runs in the child process started by benchmark_startup.
+    timings = {'module import': time.perf_counter() - PROCESS_START} # Everything imported at the top of this file. The lazily imported modules are timed in a separate process.
+
+    started = time.perf_counter()
+    try:
+        domain_info_gui = DomainInfoGUI(asset_base_url=asset_base_url, cache=WhoisCache(path=os.path.join(cache_folder, 'whois_cache.sqlite3')), asset_cache=AssetCache(os.path.join(cache_folder, 'assets')))
+    except tk.TclError: # No display (e.g. a CI worker): measure everything except drawing the window.
+        run_headless_startup_benchmark(asset_base_url, cache_folder, timings)
+        return
+    timings['widget construction'] = time.perf_counter() - started
+
+    def on_map(event): # The first time the main window is mapped, it is about to draw its first frame.
+        if event.widget is domain_info_gui.window and 'time to first frame' not in timings:
+            domain_info_gui.window.update_idletasks() # Let Tk finish drawing the frame before stopping the clock.
+            timings['time to first frame'] = time.perf_counter() - PROCESS_START
+
+    def wait_for_images(): # Stops the application once every image has been shown.
+        if 'time to first frame' in timings and not domain_info_gui.image_waiters:
+            timings['time to images shown'] = time.perf_counter() - PROCESS_START
+            domain_info_gui.exit_app()
+        else:
+            domain_info_gui.window.after(5, wait_for_images)
+
+    domain_info_gui.window.bind('<Map>', on_map, add='+')
+    domain_info_gui.window.after(5, wait_for_images)
+    domain_info_gui.window.after(60000, domain_info_gui.exit_app) # Give up rather than hang if an image never arrives.
+    domain_info_gui.window.mainloop()
+
+    for name, step in startup_profile.report().items():
+        timings[name] = step['seconds']
+    print(json.dumps({'headless': False, 'timings': timings}), flush=True)
+
+
+def run_headless_startup_benchmark(asset_base_url, cache_folder, timings): # Without a display, loads the main window's images through the same caches and worker threads the GUI uses, and prints the timings.
+    asset_cache = AssetCache(os.path.join(cache_folder, 'assets'))
+    images = [(asset_base_url + "Kwikaweb-PNG.png", (238, 40)), (asset_base_url + "Domain-Name-Registration-and-Transfer-Image.png", (226, 195))] # The images the main window shows, at the sizes it shows them.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        for future in [executor.submit(asset_cache.load, url, size) for url, size in images]:
+            future.result()
+    timings['time to images ready'] = time.perf_counter() - PROCESS_START
+    for name, step in startup_profile.report().items():
+        timings[name] = step['seconds']
+    print(json.dumps({'headless': True, 'timings': timings}), flush=True)
+
+
+# Imports each lazily imported module in a fresh interpreter and returns {module: seconds}. Done apart from the measured startups,
+# so their cost stays visible without being counted in a startup the application never does.
+def time_lazy_imports():
+    script = "import importlib, json, time\ntimes = {}\nfor name in %r:\n    started = time.perf_counter()\n    importlib.import_module(name)\n    times[name] = time.perf_counter() - started\nprint(json.dumps(times))" % (LAZY_MODULES,)
+    child = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True)
+    return json.loads(child.stdout) if child.returncode == 0 else {}
+
+
+def parse_import_times(stderr): # Reads the output of 'python -X importtime' and returns {module: cumulative seconds} for the modules imported directly by this file.
+    import_times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue # Not an import timing, or the header line.
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if name.startswith(' ') and not name.startswith('  '): # Top-level imports are indented by exactly one space.
+            import_times[name.strip()] = int(cumulative_us) / 1e6
+    return import_times
+
+
+# Startup benchmark. Each run starts the application in a fresh interpreter with a local stand-in server for its images,
+# so the numbers do not depend on the real website or the network. The first run starts with empty caches (cold), later
+# runs reuse them (warm). Results are printed as a table, or as one JSON line per run with --json for tracking between releases.
+def benchmark_startup(runs=2, json_output=False):
+    import http.server
+    import shutil
+    from PIL import Image
+
+    class QuietHandler(http.server.SimpleHTTPRequestHandler): # Serves the benchmark images without logging every request.
+        def log_message(self, format, *args):
+            pass
+
+    folder = tempfile.mkdtemp(prefix='kwikaweb-benchmark-') # Throwaway images and caches, so the user's real caches are not touched.
+    image_folder = os.path.join(folder, 'images')
+    os.makedirs(image_folder)
+    for name, size in BENCHMARK_IMAGES.items():
+        Image.new('RGBA', size, (30, 110, 200, 255)).save(os.path.join(image_folder, name))
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(QuietHandler, directory=image_folder))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    asset_base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    try:
+        lazy_imports = time_lazy_imports()
+        if json_output:
+            print(json.dumps({'lazy imports': lazy_imports}), flush=True)
+        else:
+            print("Lazy imports (paid after the first frame, when first needed)")
+            for name, seconds in lazy_imports.items():
+                print(f"  import {name:<30} {seconds * 1000:9.2f} ms")
+        for run in range(1, runs + 1):
+            child = subprocess.run([sys.executable, '-X', 'importtime', os.path.abspath(__file__), '--benchmark-run', asset_base_url, '--benchmark-cache', os.path.join(folder, 'cache')], capture_output=True, text=True)
+            if child.returncode != 0:
+                errors = '\n'.join(line for line in child.stderr.splitlines() if not line.startswith('import time:')) # Leave out the import timings.
+                print(f"Benchmark run {run} failed:\n{errors[-2000:]}", file=sys.stderr)
+                return 1
+            output = json.loads(child.stdout.strip().splitlines()[-1])
+            timings = output['timings']
+            result = {'run': run, 'cache': 'cold' if run == 1 else 'warm', 'headless': output['headless'], 'import times': parse_import_times(child.stderr), 'timings': timings}
+            if json_output:
+                print(json.dumps(result), flush=True)
+                continue
+            print(f"Run {run} ({result['cache']} cache{', no display: window not drawn' if result['headless'] else ''})")
+            for name, seconds in sorted(result['import times'].items(), key=lambda item: -item[1]):
+                print(f"  import {name:<30} {seconds * 1000:9.2f} ms")
+            for name, seconds in timings.items():
+                print(f"  {name:<37} {seconds * 1000:9.2f} ms")
+    finally:
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True) # Remove the throwaway images and caches.
+    return 0
+
+
+def main(argv=None): # Entry point. With domain names or a file on the command line it bulk checks them; otherwise it opens the GUI.
+    parser = argparse.ArgumentParser(description="Kwikaweb Domain Checker")
+    add_check_arguments(parser) # The same options as 'kwikaweb_service.py check', which prints JSON Lines instead.
+    parser.add_argument('--benchmark', action='store_true', help="measure startup time against a local stand-in image server and exit")
+    parser.add_argument('--benchmark-runs', type=int, default=2, help="number of startups to measure; the first uses empty caches (default: 2)")
+    parser.add_argument('--json', action='store_true', help="print benchmark results as JSON lines")
+    parser.add_argument('--benchmark-run', metavar='URL', help=argparse.SUPPRESS) # Used internally by --benchmark for each measured startup.
+    parser.add_argument('--benchmark-cache', metavar='FOLDER', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        return benchmark_startup(runs=args.benchmark_runs, json_output=args.json)
+    if args.benchmark_run:
+        run_startup_benchmark(args.benchmark_run, args.benchmark_cache)
+        return 0
+
+    if args.domains or args.bulk or args.keywords:
+        return run_check(args, json_lines=False) # Print a readable sentence for each result as soon as it finishes.
+
+    domain_info_gui = DomainInfoGUI() # Create an instance of the DomainInfoGUI class
+    domain_info_gui.window.mainloop() # Start the main event loop of the application
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# Author: Anuoluwapo Osinubi
+# Module Goal: The command-line side of the Kwikaweb Domain Checker: the options that choose which names to check, and a runner that
+# checks them and prints each result as it finishes. Shared by the GUI's command line and kwikaweb_service.py, and kept free of
+# tkinter and http.server so neither front end pays for the other's imports.
+
+# Import necessary libraries
+import functools   # functools for putting the cache in front of the resolver
+import itertools   # itertools for joining command-line names with names read from a file
+import json   # json for the JSON Lines output
+import sys   # sys for writing results to standard output
+
+from kwikaweb_core import WHOIS_TIMEOUT, BulkDomainChecker, TieredResolver, WhoisCache, WhoisMonitor, describe_availability, export_metrics, generate_candidates, read_domain_file
+
+
+def add_check_arguments(parser): # Adds the options that choose which names to check and how, shared by this tool and the GUI's command line.
+    parser.add_argument('domains', nargs='*', help="domain names to check")
+    parser.add_argument('--bulk', metavar='FILE', help="check every domain name listed in FILE, one per line ('-' reads standard input)")
+    parser.add_argument('--keywords', metavar='FILE', help="generate names from the keywords in FILE, one per line ('-' reads standard input)")
+    parser.add_argument('--tlds', default='com,net,org', help="comma-separated TLDs or suffixes such as co.uk for generated names (default: com,net,org)")
+    parser.add_argument('--prefixes', default='', help="comma-separated prefixes for generated names; names without a prefix are always included")
+    parser.add_argument('--suffixes', default='', help="comma-separated suffixes for generated names; names without a suffix are always included")
+    add_resolver_arguments(parser)
+    parser.add_argument('--metrics', metavar='FILE', help="write WHOIS latency and error metrics to FILE when done (CSV if it ends in .csv, otherwise JSON)")
+
+
+def add_resolver_arguments(parser): # Adds the options that tune the lookups themselves.
+    parser.add_argument('--workers', type=int, default=16, help="number of domains checked at the same time (default: 16)")
+    parser.add_argument('--per-server', type=int, default=4, help="most queries sent to one WHOIS server at the same time (default: 4)")
+    parser.add_argument('--no-cache', action='store_true', help="always ask WHOIS instead of using cached answers")
+    parser.add_argument('--no-dns', action='store_true', help="skip the DNS check and ask WHOIS about every name")
+    parser.add_argument('--dns-server', help="resolver used for the DNS check (default: the system's first name server)")
+    parser.add_argument('--whois-timeout', type=float, default=WHOIS_TIMEOUT, help=f"longest wait for a WHOIS server; servers that answer quickly get less (default: {WHOIS_TIMEOUT:g} seconds)")
+    parser.add_argument('--retries', type=int, default=1, help="times a WHOIS query that timed out or could not connect is sent again (default: 1)")
+
+
+def candidate_names(args): # Lazily yields every name the command line asks for: the names given directly, then the file, then the generated names.
+    domain_names = list(args.domains) # Names given directly on the command line are checked first.
+    if args.bulk:
+        domain_names = itertools.chain(domain_names, read_domain_file(args.bulk)) # The file is read lazily as the workers need more names.
+    if args.keywords:
+        candidates = generate_candidates(read_domain_file(args.keywords), args.tlds.split(','), [''] + args.prefixes.split(','), [''] + args.suffixes.split(','))
+        domain_names = itertools.chain(domain_names, candidates) # Generated names are produced lazily as well.
+    return domain_names
+
+
+def build_checker(args, executor=None): # Returns (checker, resolver, cache) set up from the command-line options. 'cache' is None with --no-cache.
+    cache = None if args.no_cache else WhoisCache()
+    monitor = WhoisMonitor(timeout=args.whois_timeout, retries=args.retries) # Times every WHOIS query and fails fast on servers that keep failing.
+    resolver = TieredResolver(dns_server=args.dns_server, use_dns=not args.no_dns, per_server=args.per_server, monitor=monitor)
+    check = resolver.is_domain_available if cache is None else functools.partial(cache.cached_availability, check=resolver.is_domain_available) # Cache first, then DNS, then WHOIS.
+    return BulkDomainChecker(max_workers=args.workers, check=check, executor=executor), resolver, cache
+
+
+def result_to_dict(domain_name, availability, error=None): # Turns the result of one availability check into a JSON-ready dict.
+    return {'domain': domain_name, 'available': availability, 'error': None if error is None else str(error)}
+
+
+def run_check(args, output=sys.stdout, json_lines=True): # Checks the names the command line asks for and writes each result as soon as it finishes. Returns the exit status.
+    checker, resolver, cache = build_checker(args)
+    try:
+        for domain_name, availability, error in checker.check_many(candidate_names(args)):
+            if json_lines:
+                output.write(json.dumps(result_to_dict(domain_name, availability, error)) + '\n')
+            else:
+                output.write(describe_availability(domain_name, availability, error) + '\n')
+            output.flush() # Hand each result on right away so a consumer reading the pipe can start working.
+    finally:
+        print(resolver.describe_hit_rates(), file=sys.stderr) # Report how much WHOIS traffic the DNS check saved.
+        print(resolver.monitor.describe(), file=sys.stderr) # Report how each WHOIS server behaved.
+        if args.metrics:
+            export_metrics(resolver.monitor, args.metrics)
+        if cache is not None:
+            cache.close()
+    return 0
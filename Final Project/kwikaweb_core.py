@@ -0,0 +1,1016 @@
+# Author: Anuoluwapo Osinubi
+# Module Goal: The lookup core of the Kwikaweb Domain Checker. It checks whether domain names are available, fetches WHOIS records,
+# caches both, and keeps the watchlist. It has no GUI code and does nothing when imported, so the desktop application, the command line
+# tool and the HTTP service (kwikaweb_service.py) all share it, and it can run on machines without a display.
+
+# Import necessary libraries
+# whois is slow to import and not needed until the first lookup, so it is imported inside the functions that use it.
+import time   # time for cache expiry times and the watchlist's schedule
+import concurrent.futures   # concurrent.futures for running many WHOIS queries at once on a bounded pool of worker threads
+import threading   # threading for the per-WHOIS-server semaphores that keep us from being rate-limited
+import itertools   # itertools for combining prefixes, keywords and suffixes into candidate names
+import sys   # sys for reading domain lists from standard input
+import collections   # collections for the in-memory LRU layer in front of the on-disk WHOIS cache
+import json   # json for storing cached values as text
+import os   # os for locating the cache directory in the user's home folder
+import sqlite3   # sqlite3 for the on-disk WHOIS cache that survives restarts
+import re   # re for checking that each label of a domain name only uses allowed characters
+import unicodedata   # unicodedata for normalizing international names and checking which characters they use
+import socket   # socket for the small DNS client used to rule out registered names before asking WHOIS
+import struct   # struct for packing and unpacking DNS messages
+import random   # random for DNS query IDs
+import csv   # csv for exporting WHOIS records and bulk results as spreadsheets
+import datetime   # datetime for the creation and expiry dates of WHOIS records
+import heapq   # heapq for the watchlist's queue of re-checks ordered by when they are due
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.kwikaweb') # Folder where the application keeps its caches between runs.
+
+
+WHOIS_TIMEOUT = 10.0 # Seconds a WHOIS server gets to answer before the query counts as timed out.
+
+
+def registrable_domain(domain_name): # Returns the part of a name that is registered with a registry, e.g. google.com for www.google.com. Only that part can be checked.
+    import whois # Imported here so startup does not pay for it.
+    registered = whois.extract_domain(domain_name) # Uses the public suffix list, so names like shop.example.co.uk become example.co.uk.
+    if '.' not in registered: # extract_domain returns just the TLD for suffixes it does not know.
+        return '.'.join(domain_name.split('.')[-2:])
+    return registered
+
+
+def fetch_whois_text(domain_name, server, timeout=WHOIS_TIMEOUT): # Asks one WHOIS server about a domain and returns its raw answer, without following the referral to the registrar.
+    import whois # Imported here so startup does not pay for it.
+    # Unlike whois.whois(), socket errors and timeouts are raised instead of being parsed as if they were the server's answer.
+    text = whois.NICClient().whois(domain_name, server, 0, quiet=True, timeout=timeout, ignore_socket_errors=False)
+    if not text.strip():
+        raise whois.exceptions.WhoisError("WHOIS server returned no output")
+    return text
+
+
+def referral_server(domain_name, server, text): # Returns the registrar WHOIS server named in a registry's answer, or None if there is none.
+    import whois # Imported here so startup does not pay for it.
+    referral = whois.NICClient.findwhois_server(text, server, domain_name)
+    return referral if referral and referral.lower() != server.lower() else None
+
+
+def parse_whois(domain_name, text): # Parses a WHOIS answer. Raises WhoisDomainNotFoundError if it says the domain is not registered.
+    import whois # Imported here so startup does not pay for it.
+    return whois.parser.WhoisEntry.load(domain_name, text)
+
+
+# Asks the registry's WHOIS server (by default the one the whois library picks) about a domain and returns the parsed answer.
+# With 'follow_referral' the registrar's server is asked for the fuller record as well.
+def query_whois(domain_name, server=None, timeout=WHOIS_TIMEOUT, follow_referral=True):
+    import whois # Imported here so startup does not pay for it.
+    domain_name = registrable_domain(domain_name) # Registries answer "not found" for subdomains of registered names.
+    if server is None:
+        server = whois.NICClient().choose_server(domain_name)
+        if server is None:
+            raise whois.exceptions.UnknownTldError(f"No WHOIS server is known for '{domain_name}'")
+    text = fetch_whois_text(domain_name, server, timeout)
+    entry = parse_whois(domain_name, text) # The registry's answer alone decides whether the domain is registered.
+    referral = referral_server(domain_name, server, text) if follow_referral else None
+    if referral is not None:
+        try:
+            return parse_whois(domain_name, text + fetch_whois_text(domain_name, referral, timeout))
+        except Exception:
+            pass # The registrar only adds detail; keep the registry's answer if it cannot be reached.
+    return entry
+
+
+def classify_whois_error(error): # Sorts an exception raised by a WHOIS query into one of the categories counted by WhoisMonitor.
+    import whois # Imported here so startup does not pay for it.
+    exceptions = whois.exceptions
+    if isinstance(error, exceptions.WhoisDomainNotFoundError):
+        return 'not found' # Not really an error: the registry says nobody has registered the domain.
+    if isinstance(error, exceptions.WhoisQuotaExceededError):
+        return 'rate limited'
+    if isinstance(error, exceptions.UnknownTldError):
+        return 'unsupported tld'
+    if isinstance(error, (exceptions.FailedParsingWhoisOutputError, exceptions.WhoisUnknownDateFormatError)):
+        return 'parse'
+    if isinstance(error, exceptions.PywhoisError):
+        return 'no answer'
+    if isinstance(error, (socket.timeout, TimeoutError)):
+        return 'timeout'
+    if isinstance(error, OSError):
+        return 'network'
+    return 'other'
+
+
+class WhoisLookupError(Exception): # A WHOIS query failed, so nothing is known about whether the domain is available.
+    def __init__(self, domain_name, category, server=None, cause=None):
+        detail = f"{category} from {server}" if server else category
+        super().__init__(f"WHOIS {detail}: {cause}" if cause else f"WHOIS {detail}")
+        self.domain_name = domain_name
+        self.category = category # One of the categories returned by classify_whois_error, or 'circuit open'.
+        self.server = server
+
+
+def is_domain_available(domain_name, timeout=WHOIS_TIMEOUT): # Returns True if WHOIS says the domain is not registered and False if it is. Failed queries raise instead of counting as available.
+    try:
+        query_whois(domain_name, timeout=timeout, follow_referral=False) # The registry's answer settles it; the registrar is never asked.
+        return False
+    except Exception as error:
+        if classify_whois_error(error) == 'not found':
+            return True
+        raise
+
+
+class WhoisRecord: # Compact WHOIS record holding only the normalized fields the application shows and exports, instead of the whole parser object.
+    FIELDS = ('domain', 'registrar', 'creation_date', 'expiration_date', 'name_servers', 'status')
+    __slots__ = FIELDS # No per-instance dictionary, so thousands of records stay small.
+
+    def __init__(self, domain, registrar=None, creation_date=None, expiration_date=None, name_servers=(), status=()):
+        self.domain = domain # The domain name in lowercase punycode form.
+        self.registrar = registrar # Name of the registrar, if WHOIS gave one.
+        self.creation_date = creation_date # datetime.date the domain was registered, if known.
+        self.expiration_date = expiration_date # datetime.date the registration runs out, if known.
+        self.name_servers = tuple(name_servers) # Lowercase name server host names.
+        self.status = tuple(status) # EPP status codes such as 'clientTransferProhibited'.
+
+    @classmethod
+    def from_whois(cls, domain_name, w): # Builds a record from the dictionary returned by whois.whois().
+        return cls(
+            normalize_domain(domain_name),
+            registrar=first_value(w.get('registrar')),
+            creation_date=earliest_date(w.get('creation_date')),
+            expiration_date=earliest_date(w.get('expiration_date')), # The earliest expiry is the soonest the name could drop.
+            name_servers=unique_values(value.lower().rstrip('.') for value in as_list(w.get('name_servers'))),
+            status=unique_values(value.split()[0] for value in as_list(w.get('status')) if value.split()), # Drop the explanatory URL that often follows the code.
+        )
+
+    @classmethod
+    def from_dict(cls, data): # Builds a record from the dictionary made by to_dict().
+        return cls(data['domain'], data.get('registrar'), parse_date(data.get('creation_date')), parse_date(data.get('expiration_date')), data.get('name_servers', ()), data.get('status', ()))
+
+    def to_dict(self): # Returns the record as a dictionary of JSON-friendly values.
+        return {
+            'domain': self.domain,
+            'registrar': self.registrar,
+            'creation_date': self.creation_date.isoformat() if self.creation_date else None,
+            'expiration_date': self.expiration_date.isoformat() if self.expiration_date else None,
+            'name_servers': list(self.name_servers),
+            'status': list(self.status),
+        }
+
+    def to_json(self): # Returns the record as one compact line of JSON.
+        return json.dumps(self.to_dict(), separators=(',', ':'))
+
+    def csv_row(self): # Returns the record as one CSV row, in the order of FIELDS. Lists are joined with spaces.
+        data = self.to_dict()
+        return [' '.join(value) if isinstance(value, list) else ('' if value is None else value) for value in (data[field] for field in self.FIELDS)]
+
+    def table_rows(self): # Returns (label, value) pairs for showing the record as a table.
+        return [
+            ("Domain", self.domain),
+            ("Registrar", self.registrar or "Unknown"),
+            ("Created", self.creation_date.isoformat() if self.creation_date else "Unknown"),
+            ("Expires", self.expiration_date.isoformat() if self.expiration_date else "Unknown"),
+            ("Name servers", ", ".join(self.name_servers) or "None"),
+            ("Status", ", ".join(self.status) or "None"),
+        ]
+
+    def __eq__(self, other):
+        return isinstance(other, WhoisRecord) and all(getattr(self, field) == getattr(other, field) for field in self.FIELDS)
+
+    def __hash__(self): # Equal records hash alike, so records can be kept in sets and used as dict keys.
+        return hash(tuple(getattr(self, field) for field in self.FIELDS))
+
+    def __repr__(self):
+        return f"WhoisRecord({self.domain!r}, registrar={self.registrar!r}, expiration_date={self.expiration_date!r})"
+
+
+def as_list(value): # WHOIS fields may be missing, a single value or a list; this always returns a list of non-empty strings or dates.
+    if value is None:
+        return []
+    if not isinstance(value, (list, tuple)):
+        value = [value]
+    return [item for item in value if item not in (None, '')]
+
+
+def first_value(value): # Returns the first value of a WHOIS field as a string, or None.
+    values = as_list(value)
+    return str(values[0]).strip() if values else None
+
+
+def unique_values(values): # Drops repeated values, keeping the original order.
+    return tuple(dict.fromkeys(values))
+
+
+def parse_date(value): # Turns a datetime, date or ISO date string into a datetime.date. Returns None for anything else.
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return None
+
+
+def earliest_date(value): # Returns the earliest date a WHOIS date field holds, or None.
+    dates = [date for date in map(parse_date, as_list(value)) if date is not None]
+    return min(dates) if dates else None
+
+
+def lookup_whois_record(domain_name, timeout=WHOIS_TIMEOUT): # Asks WHOIS about a domain and returns the answer as a WhoisRecord.
+    return WhoisRecord.from_whois(domain_name, query_whois(domain_name, timeout=timeout))
+
+
+def export_records(records, path): # Writes WHOIS records to 'path': a CSV file if it ends in .csv, otherwise JSON Lines. Records are written one at a time, so any iterable works.
+    with open(path, 'w', encoding='utf-8', newline='') as export_file:
+        if path.lower().endswith('.csv'):
+            writer = csv.writer(export_file)
+            writer.writerow(WhoisRecord.FIELDS)
+            writer.writerows(record.csv_row() for record in records)
+        else:
+            export_file.writelines(record.to_json() + '\n' for record in records)
+
+
+RESULT_FIELDS = ('domain', 'available', 'error') # Columns of an exported bulk check.
+
+
+def export_results(results, path): # Writes bulk check results, (domain_name, availability, error) tuples, to a CSV file if 'path' ends in .csv, otherwise JSON Lines.
+    with open(path, 'w', encoding='utf-8', newline='') as export_file:
+        rows = ((domain_name, availability, None if error is None else str(error)) for domain_name, availability, error in results)
+        if path.lower().endswith('.csv'):
+            writer = csv.writer(export_file)
+            writer.writerow(RESULT_FIELDS)
+            writer.writerows(['' if value is None else value for value in row] for row in rows)
+        else:
+            export_file.writelines(json.dumps(dict(zip(RESULT_FIELDS, row)), separators=(',', ':')) + '\n' for row in rows)
+
+
+def normalize_domain(domain_name): # Lowercases a domain name, trims whitespace and a trailing dot, and converts international names to punycode so each domain has exactly one cache key.
+    domain_name = domain_name.strip().rstrip('.').lower()
+    try:
+        return domain_name.encode('idna').decode('ascii')
+    except UnicodeError:
+        return domain_name # Not a valid international name; keep it as typed and let the lookup report the problem.
+
+
+class WhoisCache: # On-disk cache of availability verdicts and WHOIS information, with an in-memory LRU layer for repeated lookups.
+    def __init__(self, path=os.path.join(CACHE_DIR, 'whois_cache.sqlite3'), registered_ttl=24 * 3600, available_ttl=3600, max_entries=10000, memory_entries=1024):
+        self.registered_ttl = registered_ttl # Seconds a "registered" verdict (or WHOIS information) stays valid. Registrations rarely change, so this is long.
+        self.available_ttl = available_ttl # Seconds an "available" verdict stays valid. Someone may register the name at any moment, so this is short.
+        self.max_entries = max_entries # Most entries kept on disk; the least recently used ones are evicted beyond this.
+        self.memory_entries = memory_entries # Most entries kept in memory.
+        self.memory = collections.OrderedDict() # (kind, domain) -> (value, expires_at), ordered from least to most recently used.
+        self.touched = {} # (kind, domain) -> time of entries read since the last write whose on-disk 'last_used' has not been updated yet.
+        self.lock = threading.Lock() # The cache is shared by every worker thread.
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True) # Make sure the cache folder exists.
+        self.connection = sqlite3.connect(path, check_same_thread=False) # The lock above makes sharing the connection between threads safe.
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS whois_cache (kind TEXT NOT NULL, domain TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL, PRIMARY KEY (kind, domain))")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS whois_cache_last_used ON whois_cache (last_used)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS whois_cache_expires_at ON whois_cache (expires_at)")
+        self.rows = self.connection.execute("SELECT COUNT(*) FROM whois_cache").fetchone()[0] # Running count of rows on disk, so writes never have to count the table.
+
+    def get(self, kind, domain_name): # Returns the cached value of the given kind for a domain, or None if it is missing or expired.
+        key = (kind, normalize_domain(domain_name))
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None and entry[1] > now:
+                self.memory.move_to_end(key) # Mark the entry as most recently used.
+                self.touched[key] = now # Remember to refresh its on-disk 'last_used' on the next write.
+                return entry[0]
+            row = self.connection.execute("SELECT value, expires_at FROM whois_cache WHERE kind = ? AND domain = ?", key).fetchone()
+            if row is None or row[1] <= now:
+                return None
+            self.touched[key] = now # Reads never write to disk; the next put() refreshes 'last_used'.
+            value = json.loads(row[0])
+            self.remember(key, value, row[1])
+            return value
+
+    def put(self, kind, domain_name, value, ttl): # Stores a value of the given kind for a domain for 'ttl' seconds.
+        key = (kind, normalize_domain(domain_name))
+        now = time.time()
+        with self.lock:
+            self.remember(key, value, now + ttl)
+            self.touched.pop(key, None)
+            with self.connection:
+                is_new = self.connection.execute("SELECT 1 FROM whois_cache WHERE kind = ? AND domain = ?", key).fetchone() is None
+                self.connection.execute("INSERT OR REPLACE INTO whois_cache (kind, domain, value, expires_at, last_used) VALUES (?, ?, ?, ?, ?)", key + (json.dumps(value), now + ttl, now))
+                self.rows += is_new
+                # Write back the 'last_used' times of entries that were read since the last write.
+                self.connection.executemany("UPDATE whois_cache SET last_used = ? WHERE kind = ? AND domain = ?", [(used,) + touched_key for touched_key, used in self.touched.items()])
+                self.touched.clear()
+                if self.rows > self.max_entries:
+                    self.evict(now)
+
+    def remember(self, key, value, expires_at): # Adds an entry to the in-memory layer, dropping the least recently used one if it is full.
+        self.memory[key] = (value, expires_at)
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def evict(self, now): # Removes expired entries, then the least recently used ones until the cache is back under its size cap. Both deletes walk an index.
+        self.rows -= self.connection.execute("DELETE FROM whois_cache WHERE expires_at <= ?", (now,)).rowcount
+        excess = self.rows - self.max_entries
+        if excess > 0:
+            self.rows -= self.connection.execute("DELETE FROM whois_cache WHERE rowid IN (SELECT rowid FROM whois_cache ORDER BY last_used LIMIT ?)", (excess,)).rowcount
+
+    def cached_availability(self, domain_name, check=is_domain_available): # Returns the cached availability verdict for a domain, running 'check' and caching its answer on a miss.
+        availability = self.get('available', domain_name)
+        if availability is None:
+            availability = check(domain_name)
+            self.put('available', domain_name, availability, self.available_ttl if availability else self.registered_ttl)
+        return availability
+
+    def cached_whois(self, domain_name, lookup=lookup_whois_record): # Returns the cached WhoisRecord for a domain, running 'lookup' and caching its answer on a miss.
+        data = self.get('record', domain_name)
+        if data is not None:
+            return WhoisRecord.from_dict(data)
+        record = lookup(domain_name)
+        self.store_record(domain_name, record)
+        return record
+
+    def store_record(self, domain_name, record): # Caches a freshly looked-up WhoisRecord, or None for a domain WHOIS says is not registered.
+        if record is None:
+            self.put('available', domain_name, True, self.available_ttl)
+            return
+        self.put('record', domain_name, record.to_dict(), self.registered_ttl)
+        self.put('available', domain_name, False, self.registered_ttl) # A successful WHOIS lookup also proves the domain is registered.
+
+    def close(self): # Closes the on-disk cache.
+        with self.lock:
+            self.connection.close()
+
+
+LABEL_PATTERN = re.compile(r'[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?') # One label of a domain name: letters, digits and inner hyphens, 1 to 63 characters.
+TLD_PATTERN = re.compile(r'[a-z]{2,63}|xn--[a-z0-9-]{1,59}') # Top-level domains are letters only, or punycode for international ones.
+IDNA_CATEGORIES = {'Ll', 'Lo', 'Lm', 'Mn', 'Mc', 'Nd'} # Unicode categories IDNA 2008 allows in labels (lowercase letters, other letters, marks and digits).
+
+
+def validate_domain(domain_name): # Returns the punycode form of a domain name, or None if it could never be registered (bad characters, label too long, ...).
+    domain_name = domain_name.strip().rstrip('.').lower()
+    if '.' not in domain_name:
+        return None
+    domain_name = validate_suffix(domain_name)
+    return domain_name if domain_name is not None and len(domain_name) <= 253 else None
+
+
+def validate_suffix(suffix): # Returns the punycode form of a TLD or a multi-part suffix such as 'co.uk', or None if any of its labels is not allowed.
+    labels = suffix.split('.')
+    labels = [validate_label(label) for label in labels[:-1]] + [validate_label(labels[-1], TLD_PATTERN)]
+    return None if None in labels else '.'.join(labels)
+
+
+def validate_label(label, pattern=LABEL_PATTERN): # Returns the punycode form of one label of a domain name, or None if the label is not allowed.
+    if not label.isascii():
+        label = unicodedata.normalize('NFC', label)
+        if any(char != '-' and unicodedata.category(char) not in IDNA_CATEGORIES for char in label):
+            return None # Symbols, punctuation and invisible characters such as ZWJ are not allowed by IDNA 2008.
+        try:
+            ascii_label = label.encode('idna').decode('ascii') # Convert international labels; this also rejects over-long ones.
+            if ascii_label.encode('ascii').decode('idna') != label:
+                return None # Python's codec follows IDNA 2003, which maps some characters to others (faß becomes fass, a different domain); reject rather than check the wrong name.
+        except UnicodeError:
+            return None
+        label = ascii_label
+    if not pattern.fullmatch(label) or (label[2:4] == '--' and not label.startswith('xn--')):
+        return None # Hyphens in the third and fourth positions are reserved for punycode.
+    return label
+
+
+def unique_parts(parts): # Lowercases, strips and NFC-normalizes each keyword, prefix, suffix or TLD and drops duplicates, keeping the original order.
+    return list(dict.fromkeys(normalize_part(part).lstrip('.') for part in parts))
+
+
+def normalize_part(part): # Lowercases, strips and NFC-normalizes one piece of a name, so spellings that encode to the same punycode compare equal.
+    return unicodedata.normalize('NFC', part.strip().lower())
+
+
+# Generator yielding every valid, distinct domain name made of prefix + keyword + suffix + '.' + tld, in punycode form.
+# Keywords are read one at a time, so they can come from a huge file or another generator, and the combinations are
+# produced as they are needed rather than built up front. Only the keywords seen so far are remembered for removing
+# duplicates, so memory grows with the number of keywords, never with the number of combinations.
+def generate_candidates(keywords, tlds, prefixes=('',), suffixes=('',)):
+    tlds = list(dict.fromkeys(tld for tld in map(validate_suffix, unique_parts(tlds)) if tld)) # Convert the TLDs (or suffixes such as 'co.uk') once, drop any that could never be valid and compare the rest in punycode.
+    prefixes = unique_parts(prefixes) or ['']
+    suffixes = unique_parts(suffixes) or ['']
+    seen_keywords = set() # Keywords already expanded.
+    for keyword in keywords:
+        keyword = normalize_part(keyword)
+        if not keyword or keyword in seen_keywords:
+            continue # Blank or repeated keyword.
+        seen_keywords.add(keyword)
+        seen_labels = set() # Labels already produced from this keyword by another prefix/suffix pair.
+        for prefix, suffix in itertools.product(prefixes, suffixes):
+            label = prefix + keyword + suffix
+            if produced_by_earlier_keyword(label, keyword, prefixes, suffixes, seen_keywords):
+                continue # Same label as one already produced, e.g. 'my' + 'app' and 'mya' + 'pp'.
+            ascii_label = validate_label(label) # Checked once per label rather than once per TLD.
+            # validate_label only accepts labels that convert back to themselves, so distinct normalized labels give distinct
+            # punycode and the checks above on normalized text are enough; seen_labels compares the punycode all the same.
+            if ascii_label is not None and ascii_label not in seen_labels:
+                seen_labels.add(ascii_label)
+                for tld in tlds:
+                    if len(ascii_label) + len(tld) < 253: # Only a long multi-part suffix can push a name past the 253 character limit.
+                        yield f"{ascii_label}.{tld}"
+
+
+def produced_by_earlier_keyword(label, keyword, prefixes, suffixes, seen_keywords): # Tells whether another, already expanded keyword gives the same label with some other prefix and suffix.
+    for prefix in prefixes:
+        if not label.startswith(prefix):
+            continue
+        for suffix in suffixes:
+            if len(prefix) + len(suffix) >= len(label) or not label.endswith(suffix):
+                continue
+            other = label[len(prefix):len(label) - len(suffix)]
+            if other != keyword and other in seen_keywords:
+                return True
+    return False
+
+
+HOUR = 3600 # Seconds in an hour, for the watchlist schedule.
+DAY = 24 * HOUR # Seconds in a day.
+# How often a watched domain is re-checked, by days left until it expires: (at most this many days left, seconds between checks).
+# Names close to (or past) their expiry date are polled often, since that is when they drop; distant ones are polled rarely.
+WATCH_SCHEDULE = [(0, HOUR), (7, 6 * HOUR), (30, DAY), (90, 7 * DAY)]
+WATCH_DEFAULT_INTERVAL = 30 * DAY # Interval for names expiring more than 90 days from now.
+WATCH_UNKNOWN_INTERVAL = DAY # Interval for names whose expiry date is not known, or which are already available.
+
+
+def watch_interval(expiration_date, now): # Returns the number of seconds until a watched domain with this expiry date should be checked again.
+    if expiration_date is None:
+        return WATCH_UNKNOWN_INTERVAL
+    seconds_left = datetime.datetime.combine(expiration_date, datetime.time()).timestamp() - now
+    previous_days = None # Upper end of the next, more frequent band.
+    for max_days, interval in WATCH_SCHEDULE:
+        if seconds_left <= max_days * DAY:
+            if previous_days is not None:
+                interval = min(interval, max(HOUR, seconds_left - previous_days * DAY)) # Never sleep past the start of the next, more frequent band.
+            return interval
+        previous_days = max_days
+    return min(WATCH_DEFAULT_INTERVAL, max(HOUR, seconds_left - previous_days * DAY))
+
+
+class Watchlist: # Domains watched for expiry, saved to a JSON file, with re-checks kept in a priority queue ordered by when they are due.
+    def __init__(self, path=os.path.join(CACHE_DIR, 'watchlist.json')):
+        self.path = path # File the watchlist is saved in.
+        self.entries = {} # domain -> {'expiration_date', 'status', 'last_checked', 'next_check', 'last_error'}
+        self.queue = [] # Heap of (next_check, domain). Entries that were rescheduled or removed are skipped when popped.
+        try:
+            with open(path, encoding='utf-8') as watchlist_file:
+                self.entries = json.load(watchlist_file)
+        except FileNotFoundError:
+            pass # Nothing watched yet.
+        for domain_name, entry in self.entries.items():
+            heapq.heappush(self.queue, (entry['next_check'], domain_name))
+
+    def add(self, domain_name, now=None): # Starts watching a domain. It is due for a check straight away.
+        domain_name = normalize_domain(domain_name)
+        if domain_name not in self.entries:
+            self.entries[domain_name] = {'expiration_date': None, 'status': 'unknown', 'last_checked': None, 'next_check': 0, 'last_error': None}
+            self.schedule(domain_name, time.time() if now is None else now)
+        return domain_name
+
+    def remove(self, domain_name): # Stops watching a domain. Its queued check is skipped when it comes up.
+        self.entries.pop(normalize_domain(domain_name), None)
+        self.save()
+
+    def schedule(self, domain_name, next_check): # Sets when a domain is next due and queues it.
+        self.entries[domain_name]['next_check'] = next_check
+        heapq.heappush(self.queue, (next_check, domain_name))
+        self.save()
+
+    def due(self, now=None): # Removes and returns the domains whose check is due, soonest first. Only these need to be re-queried.
+        now = time.time() if now is None else now
+        due = []
+        while self.queue and self.queue[0][0] <= now:
+            next_check, domain_name = heapq.heappop(self.queue)
+            entry = self.entries.get(domain_name)
+            if entry is not None and entry['next_check'] == next_check: # Skip stale queue items left by removals and reschedules.
+                due.append(domain_name)
+        return due
+
+    def next_due(self): # Returns when the next check is due, or None if nothing is queued.
+        while self.queue:
+            next_check, domain_name = self.queue[0]
+            entry = self.entries.get(domain_name)
+            if entry is not None and entry['next_check'] == next_check:
+                return next_check
+            heapq.heappop(self.queue) # Drop a stale queue item.
+        return None
+
+    # Stores the outcome of a check and schedules the next one. 'record' is the fresh WhoisRecord, or None if WHOIS said the
+    # domain is not registered; it is ignored when 'error' is given. Returns True if the domain has just become available.
+    def record_result(self, domain_name, record=None, error=None, now=None):
+        now = time.time() if now is None else now
+        entry = self.entries.get(domain_name)
+        if entry is None:
+            return False # Removed while the check was running.
+        was_available = entry['status'] == 'available'
+        entry['last_checked'] = now
+        entry['last_error'] = None if error is None else str(error) # A failed check proves nothing, so it keeps the last definite status and expiry date.
+        if error is None and record is None:
+            entry['status'] = 'available'
+        elif error is None:
+            entry['status'] = 'registered'
+            entry['expiration_date'] = record.expiration_date.isoformat() if record.expiration_date else None
+        expiration_date = parse_date(entry['expiration_date']) if entry['status'] != 'available' else None
+        self.schedule(domain_name, now + watch_interval(expiration_date, now))
+        return entry['status'] == 'available' and not was_available
+
+    def describe(self, domain_name): # One line about a watched domain for the watchlist window.
+        entry = self.entries[domain_name]
+        next_check = datetime.datetime.fromtimestamp(entry['next_check']).strftime('%Y-%m-%d %H:%M')
+        failed = f", last check failed: {entry['last_error']}" if entry.get('last_error') else '' # Watchlists saved by older versions have no 'last_error'.
+        return f"{domain_name}: {entry['status']}, expires {entry['expiration_date'] or 'unknown'}{failed}, next check {next_check}"
+
+    def save(self): # Writes the watchlist to disk, going through a temporary file so a crash never leaves it half-written.
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as watchlist_file:
+            json.dump(self.entries, watchlist_file, indent=1)
+        os.replace(temp_path, self.path)
+
+
+def describe_availability(domain_name, availability, error=None): # Turns the result of one availability check into the message shown to the user.
+    if error is not None:
+        return f"The domain '{domain_name}' could not be checked: {error}"
+    if availability:
+        return f"The domain '{domain_name}' is available!"
+    return f"The domain '{domain_name}' is not available."
+
+
+def read_domain_names(lines): # Yields the domain names found in an iterable of lines, skipping blank lines and '#' comments.
+    for line in lines:
+        domain_name = line.split('#', 1)[0].strip() # Drop any comment and surrounding whitespace.
+        if domain_name:
+            yield domain_name
+
+
+def read_domain_file(path): # Lazily yields the domain names listed in a file, one per line. A path of '-' reads standard input.
+    if path == '-':
+        yield from read_domain_names(sys.stdin)
+        return
+    with open(path, encoding='utf-8') as domain_file:
+        yield from read_domain_names(domain_file)
+
+
+def tld_of(domain_name): # Returns the TLD of a domain name, which decides the WHOIS server a query goes to.
+    return domain_name.strip().rstrip('.').rsplit('.', 1)[-1].lower()
+
+
+class WhoisServerLimiter: # Caps how many queries may be in flight against each WHOIS server at the same time.
+    def __init__(self, per_server=4, server_for=tld_of):
+        self.per_server = per_server # Maximum number of simultaneous queries allowed per WHOIS server.
+        self.server_for = server_for # Function returning the WHOIS server a domain's query goes to. Several TLDs can share one (.com and .net both use Verisign's); the TLD is only a stand-in.
+        self.semaphores = {} # One semaphore per WHOIS server, created the first time the server is used.
+        self.lock = threading.Lock() # Protects the semaphore dictionary when several workers ask for the same server at once.
+
+    def server_key(self, domain_name): # Returns the WHOIS server a query for this domain will hit.
+        return self.server_for(domain_name)
+
+    def slot(self, domain_name): # Returns the semaphore guarding this domain's WHOIS server. Use it in a 'with' block around the query.
+        key = self.server_key(domain_name)
+        with self.lock:
+            if key not in self.semaphores:
+                self.semaphores[key] = threading.BoundedSemaphore(self.per_server)
+            return self.semaphores[key]
+
+
+DNS_TYPE_NS = 2 # DNS record type of a name server record.
+DNS_TYPE_SOA = 6 # DNS record type of a start-of-authority record.
+DNS_RCODE_NXDOMAIN = 3 # DNS response code meaning the name does not exist.
+
+
+def default_dns_server(): # Returns the first name server in /etc/resolv.conf, or a public resolver if there is none (e.g. on Windows).
+    try:
+        with open('/etc/resolv.conf', encoding='utf-8') as resolv_conf:
+            for line in resolv_conf:
+                fields = line.split()
+                if len(fields) >= 2 and fields[0] == 'nameserver':
+                    return fields[1]
+    except OSError:
+        pass
+    return '1.1.1.1'
+
+
+# Sends one DNS question to 'server' and returns (response code, number of answer records).
+# Raises OSError (socket.timeout included) if the server does not answer in time.
+def dns_query(domain_name, record_type, server, port=53, timeout=2.0):
+    query_id = random.getrandbits(16)
+    question = b''.join(bytes([len(label)]) + label.encode('ascii') for label in domain_name.split('.')) + b'\0' # The name as length-prefixed labels.
+    message = struct.pack('>HHHHHH', query_id, 0x0100, 1, 0, 0, 0) + question + struct.pack('>HH', record_type, 1) # Header asking for recursion, then the question (class IN).
+    family, _, _, _, address = socket.getaddrinfo(server, port, type=socket.SOCK_DGRAM)[0]
+    with socket.socket(family, socket.SOCK_DGRAM) as dns_socket:
+        dns_socket.settimeout(timeout)
+        dns_socket.sendto(message, address)
+        while True:
+            response = dns_socket.recv(4096)
+            if len(response) < 12:
+                continue # Too short to be a DNS reply.
+            response_id, flags, _, answer_count, _, _ = struct.unpack('>HHHHHH', response[:12])
+            if response_id == query_id and flags & 0x8000:
+                return flags & 0x000F, answer_count # Only accept the reply to this question.
+
+
+WHOIS_UNHEALTHY = ('timeout', 'network', 'no answer', 'rate limited') # Failures that say something about the server rather than the domain. They are retried and trip the circuit breaker.
+WHOIS_CATEGORIES = ('ok', 'not found') + WHOIS_UNHEALTHY + ('unsupported tld', 'parse', 'other', 'circuit open') # Every outcome WhoisMonitor counts, in report order.
+
+
+class LatencyHistogram: # Counts query latencies in fixed buckets, so the spread of thousands of queries is kept in a few integers.
+    BOUNDS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0) # Upper bound of each bucket in seconds. Slower queries go in a final overflow bucket.
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.total = 0.0 # Sum of every latency added, for the mean.
+
+    def add(self, seconds):
+        index = 0
+        while index < len(self.BOUNDS) and seconds > self.BOUNDS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.total += seconds
+
+    def count(self):
+        return sum(self.counts)
+
+    def quantile(self, fraction): # Returns the upper bound of the bucket holding the given fraction of latencies (e.g. 0.95), or None if there are none.
+        needed = fraction * self.count()
+        if not needed:
+            return None
+        seen = 0
+        for bound, count in zip(self.BOUNDS + (float('inf'),), self.counts):
+            seen += count
+            if seen >= needed:
+                return bound
+        return float('inf')
+
+    def to_dict(self): # Returns the bucket counts keyed by their upper bound, e.g. {'<=0.05s': 3, ..., '>20.0s': 0}.
+        labels = [f"<={bound}s" for bound in self.BOUNDS] + [f">{self.BOUNDS[-1]}s"]
+        return dict(zip(labels, self.counts))
+
+
+class ServerHealth: # What is known about one WHOIS server: its latencies, failures, adaptive timeout and circuit breaker.
+    def __init__(self, server):
+        self.server = server
+        self.tlds = set() # TLDs whose queries go to this server.
+        self.latency = LatencyHistogram() # Latency of every query that got an answer.
+        self.recent = collections.deque(maxlen=50) # Latencies of the latest answers, used for the adaptive timeout.
+        self.outcomes = collections.Counter() # Category -> number of queries that ended that way.
+        self.retries = 0 # Queries sent again after an unhealthy failure.
+        self.consecutive_failures = 0 # Unhealthy failures since the last answer.
+        self.state = 'closed' # Circuit state: 'closed' (queries allowed), 'open' (failing fast) or 'half-open' (one trial query allowed).
+        self.open_until = 0.0 # time.monotonic() at which an open circuit lets a trial query through.
+        self.cooldown = 0.0 # How long the circuit stays open the next time it trips. Doubles each time the trial query fails.
+        self.trial_running = False # Whether the half-open trial query is in flight.
+
+    def p95(self): # 95th percentile of the recent latencies, or None with too few answers to tell.
+        if len(self.recent) < 5:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+
+# Wraps every WHOIS query with instrumentation and protection for the servers it talks to:
+# - latency histograms per TLD and per server, plus counts of each outcome, retries and timeouts;
+# - an adaptive timeout per server, a few times its recent 95th percentile latency, so a healthy fast server never makes
+#   us wait the full default timeout;
+# - unhealthy failures (timeouts, connection errors, empty answers, rate limiting) are retried, and after 'failure_threshold'
+#   of them in a row the server's circuit opens: queries fail at once for 'cooldown' seconds instead of waiting on a dead
+#   server, then a single trial query decides whether it closes again.
+# A failed query raises WhoisLookupError; only an explicit "not found" from the registry counts as available.
+class WhoisMonitor:
+    def __init__(self, timeout=WHOIS_TIMEOUT, min_timeout=2.0, retries=1, failure_threshold=5, cooldown=30.0, max_cooldown=600.0, query=fetch_whois_text):
+        self.timeout = timeout # Timeout used for servers with too few answers to adapt to, and the most any server is given.
+        self.min_timeout = min_timeout # Least time any server is given to answer.
+        self.retries = retries # How many times a query that failed for an unhealthy reason is sent again.
+        self.failure_threshold = failure_threshold # Unhealthy failures in a row that open a server's circuit.
+        self.base_cooldown = cooldown # Seconds an open circuit fails fast before its first trial query.
+        self.max_cooldown = max_cooldown # Longest an open circuit waits between trial queries.
+        self.query = query # Function (domain_name, server, timeout) that asks one WHOIS server and returns its raw answer.
+        self.servers = {} # Server host name -> ServerHealth.
+        self.tld_servers = {} # TLD -> server host name, so the server is looked up once per TLD instead of on every query.
+        self.tld_latency = collections.defaultdict(LatencyHistogram) # TLD -> latencies of its queries.
+        self.tld_outcomes = collections.defaultdict(collections.Counter) # TLD -> category -> number of queries.
+        self.lock = threading.Lock() # Every worker thread reports to the same monitor.
+
+    def server_for(self, domain_name): # Returns the WHOIS server for the domain's TLD, asking the whois library (and IANA) only the first time.
+        import whois # Imported here so startup does not pay for it.
+        tld = tld_of(domain_name)
+        with self.lock:
+            server = self.tld_servers.get(tld)
+        if server is None:
+            try:
+                server = whois.NICClient().choose_server(domain_name)
+            except OSError as error: # IANA could not be asked. Nothing is cached, so the next query tries again.
+                category = classify_whois_error(error)
+                self.record(tld, None, category)
+                raise WhoisLookupError(domain_name, category, 'whois.iana.org', error) from error
+            if server is None:
+                self.record(tld, None, 'unsupported tld')
+                raise WhoisLookupError(domain_name, 'unsupported tld')
+            with self.lock:
+                self.tld_servers[tld] = server
+                self.health(server).tlds.add(tld)
+        return server
+
+    def health(self, server): # Returns the ServerHealth of a server, creating it on first use. Call with the lock held.
+        if server not in self.servers:
+            self.servers[server] = ServerHealth(server)
+        return self.servers[server]
+
+    def is_open(self, domain_name): # Tells whether queries for this domain would fail fast right now, without using up a half-open trial.
+        tld = tld_of(domain_name)
+        with self.lock:
+            server = self.tld_servers.get(tld)
+            if server is None:
+                return False
+            health = self.health(server)
+            return (health.state == 'open' and time.monotonic() < health.open_until) or (health.state == 'half-open' and health.trial_running)
+
+    def fail_fast(self, domain_name): # Raises WhoisLookupError without contacting the server if its circuit is open.
+        if self.is_open(domain_name):
+            server = self.tld_servers[tld_of(domain_name)]
+            self.record(tld_of(domain_name), server, 'circuit open')
+            raise WhoisLookupError(domain_name, 'circuit open', server)
+
+    def acquire(self, server): # Decides whether a query may be sent to the server now and returns the timeout to give it; raises if the circuit is open.
+        with self.lock:
+            health = self.health(server)
+            if health.state == 'open':
+                if time.monotonic() < health.open_until:
+                    return None
+                health.state = 'half-open' # The cooldown is over; let one trial query through.
+            if health.state == 'half-open':
+                if health.trial_running:
+                    return None
+                health.trial_running = True
+            return self.timeout_for(health)
+
+    def timeout_for(self, health): # A few times the server's recent 95th percentile latency, kept between min_timeout and timeout. Call with the lock held.
+        p95 = health.p95()
+        return self.timeout if p95 is None else min(self.timeout, max(self.min_timeout, 3 * p95))
+
+    def record(self, tld, server, category, seconds=None, retried=False): # Counts the outcome of one query against its TLD (if any) and server and updates the server's circuit.
+        with self.lock:
+            if tld is not None: # Registrar queries are not counted against the TLD.
+                self.tld_outcomes[tld][category] += 1
+                if seconds is not None and category != 'circuit open':
+                    self.tld_latency[tld].add(seconds)
+            if server is None:
+                return
+            health = self.health(server)
+            health.outcomes[category] += 1
+            health.retries += retried
+            if category == 'circuit open':
+                return
+            if seconds is not None:
+                health.latency.add(seconds)
+            health.trial_running = False
+            if category in WHOIS_UNHEALTHY:
+                health.consecutive_failures += 1
+                if health.state == 'half-open': # The trial query failed too; wait twice as long before the next one.
+                    self.trip(health, min(self.max_cooldown, health.cooldown * 2))
+                elif health.state == 'closed' and health.consecutive_failures >= self.failure_threshold:
+                    self.trip(health, self.base_cooldown)
+            elif category != 'other': # The server answered, even if the answer could not be used.
+                if seconds is not None:
+                    health.recent.append(seconds)
+                health.consecutive_failures = 0
+                health.state = 'closed'
+                health.cooldown = 0.0
+
+    def trip(self, health, cooldown): # Opens a server's circuit for 'cooldown' seconds. Call with the lock held.
+        health.state = 'open'
+        health.cooldown = cooldown
+        health.open_until = time.monotonic() + cooldown
+
+    # Asks WHOIS about a domain. Returns the parsed answer, or None if the registry says the domain is not registered.
+    # With 'follow_referral' the registrar's server is asked for the fuller record as well; availability checks leave it off.
+    def lookup(self, domain_name, follow_referral=False):
+        domain_name = registrable_domain(domain_name) # Registries answer "not found" for subdomains of registered names.
+        tld = tld_of(domain_name)
+        server = self.server_for(domain_name)
+        failure = None # The last failure, reported instead if the circuit opens before a retry.
+        for attempt in range(self.retries + 1):
+            timeout = self.acquire(server)
+            if timeout is None:
+                if failure is not None:
+                    raise failure
+                self.record(tld, server, 'circuit open')
+                raise WhoisLookupError(domain_name, 'circuit open', server)
+            if attempt:
+                time.sleep(random.uniform(0.1, 0.5) * attempt) # Back off a little so a rate-limited server can catch up.
+            started = time.perf_counter()
+            try:
+                text = self.query(domain_name, server, timeout)
+                entry = parse_whois(domain_name, text)
+            except Exception as error:
+                seconds = time.perf_counter() - started
+                category = classify_whois_error(error)
+                if category == 'not found':
+                    self.record(tld, server, category, seconds, retried=attempt > 0)
+                    return None
+                self.record(tld, server, category, seconds, retried=attempt > 0)
+                failure = WhoisLookupError(domain_name, category, server, error)
+                failure.__cause__ = error
+                if category in WHOIS_UNHEALTHY and attempt < self.retries:
+                    continue
+                raise failure
+            self.record(tld, server, 'ok', time.perf_counter() - started, retried=attempt > 0)
+            return self.follow_referral(domain_name, server, text, entry) if follow_referral else entry
+
+    # Asks the registrar WHOIS server named in the registry's answer for the fuller record. This is best effort: the registry
+    # has already said the domain is registered, so a registrar failure is charged to the registrar and the registry's answer is kept.
+    def follow_referral(self, domain_name, server, text, entry):
+        referral = referral_server(domain_name, server, text)
+        if referral is None:
+            return entry
+        timeout = self.acquire(referral)
+        if timeout is None:
+            self.record(None, referral, 'circuit open')
+            return entry
+        started = time.perf_counter()
+        try:
+            combined = parse_whois(domain_name, text + self.query(domain_name, referral, timeout))
+        except Exception as error:
+            self.record(None, referral, classify_whois_error(error), time.perf_counter() - started)
+            return entry
+        self.record(None, referral, 'ok', time.perf_counter() - started)
+        return combined
+
+    def is_domain_available(self, domain_name): # Returns True if the registry says the domain is not registered and False if it is. Raises WhoisLookupError if WHOIS could not tell.
+        return self.lookup(domain_name) is None # The registry's answer settles it; the registrar is never asked.
+
+    def lookup_record(self, domain_name): # Returns the domain's WhoisRecord, or None if it is not registered. Raises WhoisLookupError if WHOIS could not tell.
+        entry = self.lookup(domain_name, follow_referral=True)
+        return None if entry is None else WhoisRecord.from_whois(domain_name, entry)
+
+    def snapshot(self): # Returns every metric as plain data: {'servers': [...], 'tlds': [...]}, one dict per server and per TLD.
+        now = time.monotonic()
+        with self.lock:
+            servers = [{
+                'server': health.server,
+                'tlds': sorted(health.tlds),
+                'state': health.state,
+                'opens in': max(0.0, health.open_until - now) if health.state == 'open' else 0.0,
+                'queries': health.latency.count(),
+                'outcomes': {category: health.outcomes[category] for category in WHOIS_CATEGORIES},
+                'retries': health.retries,
+                'mean': health.latency.total / health.latency.count() if health.latency.count() else None,
+                'p50': health.latency.quantile(0.5),
+                'p95': health.latency.quantile(0.95),
+                'timeout': self.timeout_for(health),
+                'histogram': health.latency.to_dict(),
+            } for health in self.servers.values()]
+            tlds = [{
+                'tld': tld,
+                'server': self.tld_servers.get(tld),
+                'queries': self.tld_latency[tld].count(),
+                'outcomes': {category: outcomes[category] for category in WHOIS_CATEGORIES},
+                'mean': self.tld_latency[tld].total / self.tld_latency[tld].count() if self.tld_latency[tld].count() else None,
+                'p50': self.tld_latency[tld].quantile(0.5),
+                'p95': self.tld_latency[tld].quantile(0.95),
+                'histogram': self.tld_latency[tld].to_dict(),
+            } for tld, outcomes in self.tld_outcomes.items()]
+        return {'servers': servers, 'tlds': tlds}
+
+    def describe(self): # Sums up the health of every server in a few lines for the user.
+        lines = []
+        for server in sorted(self.snapshot()['servers'], key=lambda server: server['server']):
+            failures = sum(server['outcomes'][category] for category in WHOIS_UNHEALTHY)
+            p95 = "-" if server['p95'] is None else f"{server['p95']:g}s"
+            lines.append(f"{server['server']} ({', '.join(server['tlds'])}): {server['state']}, {server['queries']} queries, {failures} failed, {server['outcomes']['timeout']} timed out, {server['retries']} retried, p95 {p95}, timeout {server['timeout']:.1f}s")
+        return '\n'.join(lines) or "No WHOIS queries yet."
+
+
+METRIC_FIELDS = ('scope', 'name', 'server', 'state', 'queries', 'retries', 'mean', 'p50', 'p95', 'timeout_s') + WHOIS_CATEGORIES # Columns of an exported metrics CSV file. 'timeout_s' is the adaptive timeout; 'timeout' counts queries that timed out.
+
+
+def export_metrics(monitor, path): # Writes a WhoisMonitor's metrics to 'path': a CSV file with one row per server and per TLD if it ends in .csv, otherwise one JSON document.
+    snapshot = monitor.snapshot()
+    with open(path, 'w', newline='', encoding='utf-8') as metrics_file:
+        if not path.lower().endswith('.csv'):
+            json.dump(snapshot, metrics_file, indent=2)
+            return
+        writer = csv.writer(metrics_file)
+        writer.writerow(METRIC_FIELDS)
+        for server in snapshot['servers']:
+            writer.writerow(['server', server['server'], server['server'], server['state'], server['queries'], server['retries'], server['mean'], server['p50'], server['p95'], server['timeout']] + [server['outcomes'][category] for category in WHOIS_CATEGORIES])
+        for tld in snapshot['tlds']:
+            writer.writerow(['tld', tld['tld'], tld['server'], '', tld['queries'], '', tld['mean'], tld['p50'], tld['p95'], ''] + [tld['outcomes'][category] for category in WHOIS_CATEGORIES])
+
+
+# Decides availability in tiers. A cheap DNS lookup goes first: a name with NS (or SOA) records is delegated, so it is
+# certainly registered. Only names DNS cannot prove are taken are passed on to the much slower WHOIS check.
+# The DNS server and the WHOIS check can both be replaced, so each tier can be pointed at a local stand-in.
+class TieredResolver:
+    def __init__(self, dns_server=None, dns_port=53, dns_timeout=2.0, use_dns=True, whois_check=None, per_server=4, monitor=None):
+        self.dns_server = dns_server or default_dns_server() # Recursive resolver asked for the DNS tier.
+        self.dns_port = dns_port
+        self.dns_timeout = dns_timeout # Seconds to wait for a DNS answer before falling back to WHOIS.
+        self.use_dns = use_dns # With this turned off every name goes straight to WHOIS.
+        self.monitor = monitor or WhoisMonitor() # Times every WHOIS query and stops sending queries to servers that keep failing.
+        self.whois_check = whois_check or self.monitor.is_domain_available # The function that asks WHOIS whether a domain is available.
+        self.limiter = WhoisServerLimiter(per_server, server_for=self.monitor.server_for) # Keeps any single WHOIS server from receiving more than 'per_server' queries at once.
+        self.stats = collections.Counter() # How many names each tier settled.
+        self.lock = threading.Lock() # The counters are updated by every worker thread.
+
+    def is_domain_available(self, domain_name): # Returns True if the domain is available and False if it is registered.
+        domain_name = registrable_domain(domain_name) # www.google.com is taken because google.com is; neither tier can tell that from the full name.
+        if self.use_dns:
+            try:
+                if self.has_dns_records(domain_name):
+                    self.count('dns registered')
+                    return False
+            except OSError:
+                self.count('dns errors') # The resolver did not answer; let WHOIS decide.
+        try:
+            self.monitor.fail_fast(domain_name) # Do not queue for a slot on a server whose circuit is open.
+            with self.limiter.slot(domain_name):
+                availability = self.whois_check(domain_name)
+        except Exception:
+            self.count('whois errors')
+            raise
+        self.count('whois available' if availability else 'whois registered')
+        return availability
+
+    def lookup_record(self, domain_name): # Asks WHOIS for a fresh WhoisRecord under the per-server limit. Returns None if WHOIS says the domain is not registered.
+        domain_name = registrable_domain(domain_name)
+        try:
+            self.monitor.fail_fast(domain_name)
+            with self.limiter.slot(domain_name):
+                record = self.monitor.lookup_record(domain_name)
+        except Exception:
+            self.count('whois errors')
+            raise
+        self.count('whois registered' if record else 'whois available')
+        return record
+
+    def has_dns_records(self, domain_name): # Tells whether the domain is delegated in DNS, which proves it is registered.
+        rcode, answers = dns_query(domain_name, DNS_TYPE_NS, self.dns_server, self.dns_port, self.dns_timeout)
+        if answers:
+            return True
+        if rcode == DNS_RCODE_NXDOMAIN:
+            return False # The name does not exist in DNS at all.
+        rcode, answers = dns_query(domain_name, DNS_TYPE_SOA, self.dns_server, self.dns_port, self.dns_timeout) # The name exists but has no NS records; a zone of its own still proves it is registered.
+        return answers > 0
+
+    def count(self, outcome): # Adds one name to the counter for the tier that settled it.
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def hit_rates(self): # Returns the counters plus the share of names settled by DNS, i.e. the WHOIS queries avoided.
+        with self.lock:
+            stats = dict(self.stats)
+        dns_hits = stats.get('dns registered', 0)
+        whois_queries = stats.get('whois available', 0) + stats.get('whois registered', 0)
+        total = dns_hits + whois_queries
+        stats['dns hit rate'] = dns_hits / total if total else 0.0
+        stats['whois rate'] = whois_queries / total if total else 0.0
+        return stats
+
+    def describe_hit_rates(self): # Sums up the tier counters in one line for the user.
+        stats = self.hit_rates()
+        return f"DNS settled {stats['dns hit rate']:.0%} of lookups ({stats.get('dns registered', 0)} WHOIS queries avoided); WHOIS answered {stats.get('whois available', 0) + stats.get('whois registered', 0)} times and failed {stats.get('whois errors', 0)} times."
+
+
+class BulkDomainChecker: # Checks many domain names concurrently and hands back each result as soon as it finishes.
+    def __init__(self, max_workers=16, check=None, executor=None):
+        self.max_workers = max_workers # Size of the worker pool, i.e. the most checks that run at the same time overall.
+        self.check = check or TieredResolver().is_domain_available # The function that decides whether a single domain is available.
+        self.executor = executor # Optional pool shared with other runs (e.g. every client of the HTTP service). None gives each run its own pool.
+
+    def check_one(self, domain_name): # Checks a single domain. Errors are returned instead of raised.
+        ascii_name = validate_domain(domain_name)
+        if ascii_name is None:
+            return domain_name, None, ValueError("not a valid domain name") # Never spend a query on a name that cannot exist.
+        try:
+            return domain_name, self.check(ascii_name), None
+        except Exception as error: # A failed lookup should not stop the rest of the run.
+            return domain_name, None, error
+
+    # Generator yielding (domain_name, availability, error) tuples in the order the checks finish.
+    # Names are pulled from 'domain_names' only as fast as the pool can work through them, so very long lists
+    # (or generators) never have to sit in memory all at once.
+    def check_many(self, domain_names):
+        max_in_flight = self.max_workers * 2 # Keep the workers busy without queueing the whole input up front.
+        executor = self.executor or concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = set()
+        try:
+            for domain_name in domain_names:
+                pending.add(executor.submit(self.check_one, domain_name))
+                if len(pending) >= max_in_flight:
+                    # Wait for at least one check to finish before submitting more work.
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in concurrent.futures.as_completed(pending):
+                yield future.result()
+        finally:
+            # If the caller stops early, drop the checks that have not started yet instead of waiting for them.
+            if self.executor is None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                for future in pending: # A shared pool keeps running for everyone else; only this run's checks are dropped.
+                    future.cancel()
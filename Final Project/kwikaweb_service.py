@@ -0,0 +1,166 @@
+# Author: Anuoluwapo Osinubi
+# Module Goal: Headless front ends for the Kwikaweb Domain Checker. 'check' streams availability results as JSON Lines, and 'serve' runs
+# a small local HTTP API that many clients can use at once. Both use the lookup core in kwikaweb_core.py and never touch tkinter,
+# so they run on servers and batch workers without a display, and several of them can share one cache folder.
+#
+# Examples:
+#   python kwikaweb_service.py check example.com --bulk names.txt > results.jsonl
+#   python kwikaweb_service.py serve --port 8053
+#   curl 'http://127.0.0.1:8053/check?domain=example.com&domain=example.net'
+#   curl --data-binary @names.txt http://127.0.0.1:8053/check
+#   curl http://127.0.0.1:8053/metrics
+
+# Import necessary libraries
+import argparse   # argparse for the command-line interface
+import concurrent.futures   # concurrent.futures for the worker pool shared by every client of the HTTP service
+import itertools   # itertools for capping how many names one request may check
+import json   # json for the HTTP responses
+import sys   # sys for writing results to standard output
+import urllib.parse   # urllib.parse for reading the query string of HTTP requests
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer   # http.server for the local HTTP API, one thread per client
+
+from kwikaweb_cli import add_check_arguments, add_resolver_arguments, build_checker, result_to_dict, run_check
+from kwikaweb_core import read_domain_names, validate_domain
+
+
+class LookupService: # State shared by every client of the HTTP API: one cache, one resolver (so the per-server limits hold across clients) and one worker pool.
+    MAX_NAMES = 10000 # Most names accepted in one request, so a single client cannot tie up the pool indefinitely.
+
+    def __init__(self, args):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=args.workers) # Shared by all clients; the total number of lookups in flight never grows with the number of clients.
+        self.checker, self.resolver, self.cache = build_checker(args, executor=self.executor)
+
+    def check_many(self, domain_names): # Yields (domain_name, availability, error) tuples in the order the checks finish.
+        return self.checker.check_many(itertools.islice(domain_names, self.MAX_NAMES))
+
+    def whois(self, domain_name): # Returns the WHOIS record for a domain as a dict, or None if the domain is not registered.
+        lookup = self.resolver.lookup_record
+        record = lookup(domain_name) if self.cache is None else self.cache.cached_whois(domain_name, lookup=lookup)
+        return None if record is None else record.to_dict()
+
+    def health(self): # Returns a small status report for load balancers and monitoring.
+        servers = self.resolver.monitor.snapshot()['servers']
+        return {'status': 'ok', 'tiers': self.resolver.hit_rates(), 'open circuits': sorted(server['server'] for server in servers if server['state'] != 'closed')}
+
+    def metrics(self): # Returns the WHOIS latency and error metrics of every server and TLD.
+        return self.resolver.monitor.snapshot()
+
+    def close(self): # Stops the worker pool and closes the cache.
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.cache is not None:
+            self.cache.close()
+
+
+class LookupRequestHandler(BaseHTTPRequestHandler): # Answers one HTTP request. ThreadingHTTPServer runs each client on its own thread.
+    protocol_version = 'HTTP/1.1'
+    MAX_BODY = 1024 * 1024 # Largest request body accepted, in bytes.
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        if url.path == '/check':
+            self.stream_results(query.get('domain', []))
+        elif url.path == '/whois':
+            self.send_whois(query.get('domain', [''])[0])
+        elif url.path == '/health':
+            self.send_json(200, self.server.service.health())
+        elif url.path == '/metrics':
+            self.send_json(200, self.server.service.metrics())
+        else:
+            self.send_json(404, {'error': "unknown path; use /check, /whois, /health or /metrics"})
+
+    def do_POST(self): # POST /check takes a body of domain names, one per line.
+        if urllib.parse.urlsplit(self.path).path != '/check':
+            self.send_json(404, {'error': "unknown path; POST is only accepted on /check"})
+            return
+        length = self.headers.get('Content-Length')
+        if length is None:
+            self.send_json(411, {'error': "a Content-Length header is required"})
+            return
+        if not length.strip().isdigit(): # Rejects negative and non-numeric lengths; read(-1) would wait until the client hangs up.
+            self.send_json(400, {'error': "Content-Length must be a non-negative whole number"})
+            return
+        length = int(length)
+        if length > self.MAX_BODY:
+            self.send_json(413, {'error': f"request body is larger than {self.MAX_BODY} bytes"})
+            return
+        body = self.rfile.read(length).decode('utf-8', errors='replace')
+        self.stream_results(read_domain_names(body.splitlines()))
+
+    def stream_results(self, domain_names): # Sends each result as one JSON line as soon as it finishes, using chunked encoding.
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        results = self.server.service.check_many(domain_names)
+        try:
+            for result in results:
+                line = (json.dumps(result_to_dict(*result)) + '\n').encode('utf-8')
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(line), line))
+                self.wfile.flush()
+            self.wfile.write(b'0\r\n\r\n')
+        except (BrokenPipeError, ConnectionResetError): # The client went away; stop checking names nobody will read.
+            self.close_connection = True
+        finally:
+            results.close() # Cancels this client's checks that have not started yet.
+
+    def send_whois(self, domain_name):
+        ascii_name = validate_domain(domain_name)
+        if ascii_name is None:
+            self.send_json(400, {'error': f"'{domain_name}' is not a valid domain name"})
+            return
+        try:
+            record = self.server.service.whois(ascii_name)
+        except Exception as error: # Report lookup failures to the client instead of dropping the connection. They never mean the domain is available.
+            self.send_json(502, {'domain': ascii_name, 'error': str(error), 'category': getattr(error, 'category', 'other')})
+            return
+        self.send_json(200, {'domain': ascii_name, 'available': record is None, 'record': record})
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args): # Log requests to standard error only with --verbose.
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def serve(args): # Runs the HTTP API until interrupted.
+    server = ThreadingHTTPServer((args.host, args.port), LookupRequestHandler)
+    server.daemon_threads = True # Do not wait for slow clients when shutting down.
+    server.service = LookupService(args)
+    server.verbose = args.verbose
+    print(f"Serving on http://{server.server_address[0]}:{server.server_address[1]}/", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kwikaweb Domain Checker without a GUI")
+    commands = parser.add_subparsers(dest='command', required=True)
+    check_parser = commands.add_parser('check', help="check domain names and print one JSON line per result")
+    add_check_arguments(check_parser)
+    check_parser.add_argument('--text', action='store_true', help="print readable sentences instead of JSON Lines")
+    serve_parser = commands.add_parser('serve', help="run the local HTTP API")
+    serve_parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument('--port', type=int, default=8053, help="port to listen on (default: 8053)")
+    serve_parser.add_argument('--verbose', action='store_true', help="log every request to standard error")
+    add_resolver_arguments(serve_parser)
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        return serve(args)
+    return run_check(args, json_lines=not args.text)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+# Author: Anuoluwapo Osinubi
+# Tests for the DNS and WHOIS tiers of TieredResolver and for WhoisMonitor, run against a local stub DNS server and a stub
+# WHOIS query, so they need no network. Run with: python -m unittest test_kwikaweb_core (or pytest) from this folder.
+
+# Import necessary libraries
+import socket   # socket for the stub DNS server
+import struct   # struct for reading questions and packing replies
+import threading   # threading for running the stub DNS server in the background
+import unittest   # unittest for the test cases
+
+from kwikaweb_core import DNS_RCODE_NXDOMAIN, DNS_TYPE_NS, DNS_TYPE_SOA, TieredResolver, WhoisLookupError, WhoisMonitor
+
+
+class StubDNSServer: # Answers DNS questions on a local UDP port from a table of domain -> {record type: answer count}, or a response code.
+    def __init__(self, zones):
+        self.zones = zones # domain -> {DNS_TYPE_NS: n, DNS_TYPE_SOA: n}, DNS_RCODE_NXDOMAIN, or None to never answer (a timeout).
+        self.questions = [] # (domain, record type) of every question received.
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(('127.0.0.1', 0))
+        self.port = self.socket.getsockname()[1]
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self):
+        while True:
+            try:
+                message, address = self.socket.recvfrom(512)
+            except OSError:
+                return # The socket was closed.
+            query_id = struct.unpack('>H', message[:2])[0]
+            labels, offset = [], 12
+            while message[offset]:
+                labels.append(message[offset + 1:offset + 1 + message[offset]].decode('ascii'))
+                offset += 1 + message[offset]
+            domain_name = '.'.join(labels)
+            record_type = struct.unpack('>H', message[offset + 1:offset + 3])[0]
+            self.questions.append((domain_name, record_type))
+            zone = self.zones.get(domain_name, {})
+            if zone is None:
+                continue # Stay silent so the client times out.
+            rcode = DNS_RCODE_NXDOMAIN if zone == DNS_RCODE_NXDOMAIN else 0
+            answers = 0 if rcode else zone.get(record_type, 0)
+            # dns_query only reads the header, so the reply carries the question but no actual records.
+            header = struct.pack('>HHHHHH', query_id, 0x8180 | rcode, 1, answers, 0, 0)
+            self.socket.sendto(header + message[12:], address)
+
+    def close(self):
+        self.socket.close()
+
+
+class TieredResolverTest(unittest.TestCase):
+    def setUp(self):
+        self.dns = StubDNSServer({
+            'delegated.com': {DNS_TYPE_NS: 2},
+            'zoneonly.com': {DNS_TYPE_SOA: 1},
+            'missing.com': DNS_RCODE_NXDOMAIN,
+            'parked.com': {}, # Exists in DNS but has no NS or SOA records, so WHOIS must decide.
+            'slow.com': None,
+        })
+        self.addCleanup(self.dns.close)
+        self.whois_queries = [] # Domains the stub WHOIS server was asked about.
+        self.registered = {'delegated.com', 'zoneonly.com', 'parked.com', 'slow.com'} # What the stub registry has on file.
+        monitor = WhoisMonitor(query=self.whois_answer)
+        monitor.tld_servers['com'] = 'whois.stub.example' # Skip asking IANA which server handles .com.
+        self.resolver = TieredResolver(dns_server='127.0.0.1', dns_port=self.dns.port, dns_timeout=0.2, monitor=monitor)
+
+    def whois_answer(self, domain_name, server, timeout): # Stub WHOIS server, answering like Verisign does.
+        self.whois_queries.append(domain_name)
+        if domain_name in self.registered:
+            return f"   Domain Name: {domain_name.upper()}\r\n   Registrar: Stub Registrar\r\n"
+        return f'No match for "{domain_name.upper()}".\r\n'
+
+    def test_ns_records_prove_registration_without_whois(self):
+        self.assertFalse(self.resolver.is_domain_available('delegated.com'))
+        self.assertEqual(self.whois_queries, [])
+        self.assertEqual(self.resolver.stats['dns registered'], 1)
+
+    def test_soa_record_proves_registration_without_whois(self):
+        self.assertFalse(self.resolver.is_domain_available('zoneonly.com'))
+        self.assertEqual(self.dns.questions, [('zoneonly.com', DNS_TYPE_NS), ('zoneonly.com', DNS_TYPE_SOA)])
+        self.assertEqual(self.whois_queries, [])
+
+    def test_nxdomain_goes_to_whois(self):
+        self.assertTrue(self.resolver.is_domain_available('missing.com'))
+        self.assertEqual(self.dns.questions, [('missing.com', DNS_TYPE_NS)]) # NXDOMAIN needs no SOA question.
+        self.assertEqual(self.whois_queries, ['missing.com'])
+        self.assertEqual(self.resolver.stats['whois available'], 1)
+
+    def test_name_without_delegation_goes_to_whois(self):
+        self.assertFalse(self.resolver.is_domain_available('parked.com'))
+        self.assertEqual(self.whois_queries, ['parked.com'])
+        self.assertEqual(self.resolver.stats['whois registered'], 1)
+
+    def test_dns_timeout_falls_back_to_whois(self):
+        self.assertFalse(self.resolver.is_domain_available('slow.com'))
+        self.assertEqual(self.whois_queries, ['slow.com'])
+        self.assertEqual(self.resolver.stats['dns errors'], 1)
+        self.assertEqual(self.resolver.stats['whois registered'], 1)
+
+    def test_hit_rates(self):
+        for domain_name in ('delegated.com', 'zoneonly.com', 'missing.com', 'parked.com'):
+            self.resolver.is_domain_available(domain_name)
+        stats = self.resolver.hit_rates()
+        self.assertEqual(stats['dns registered'], 2)
+        self.assertEqual(stats['whois available'] + stats['whois registered'], 2)
+        self.assertEqual(stats['dns hit rate'], 0.5)
+        self.assertEqual(stats['whois rate'], 0.5)
+
+    def test_dns_can_be_turned_off(self):
+        self.resolver.use_dns = False
+        self.assertFalse(self.resolver.is_domain_available('delegated.com'))
+        self.assertEqual(self.dns.questions, [])
+        self.assertEqual(self.whois_queries, ['delegated.com'])
+
+
+class WhoisMonitorTest(unittest.TestCase):
+    def setUp(self):
+        self.queries = [] # (domain, server) of every query sent.
+        self.failures = [] # Exceptions the stub registry raises, one per query, before it answers normally again.
+        self.monitor = self.make_monitor()
+
+    def make_monitor(self, **options):
+        monitor = WhoisMonitor(query=self.whois_answer, **options)
+        monitor.tld_servers['com'] = 'whois.stub.example'
+        return monitor
+
+    def whois_answer(self, domain_name, server, timeout): # Stub registry that refers to a registrar, and the registrar itself.
+        self.queries.append((domain_name, server))
+        if self.failures:
+            raise self.failures.pop(0)
+        if domain_name == 'free.com':
+            return 'No match for "FREE.COM".\r\n'
+        if server == 'whois.registrar.example':
+            return "Registrant Organization: Stub Holdings\r\n"
+        return f"   Domain Name: {domain_name.upper()}\r\n   Registrar WHOIS Server: whois.registrar.example\r\n   Registrar: Stub Registrar\r\n"
+
+    def test_availability_check_does_not_follow_referral(self):
+        self.assertFalse(self.monitor.is_domain_available('taken.com'))
+        self.assertEqual(self.queries, [('taken.com', 'whois.stub.example')])
+
+    def test_record_lookup_follows_referral(self):
+        record = self.monitor.lookup_record('taken.com')
+        self.assertEqual(record.registrar, 'Stub Registrar')
+        self.assertEqual(self.queries, [('taken.com', 'whois.stub.example'), ('taken.com', 'whois.registrar.example')])
+
+    def test_only_not_found_means_available(self):
+        self.assertTrue(self.monitor.is_domain_available('free.com'))
+        monitor = self.make_monitor(retries=0)
+        for error, category in ((socket.timeout("timed out"), 'timeout'), (ConnectionRefusedError("refused"), 'network')):
+            self.failures.append(error)
+            with self.assertRaises(WhoisLookupError) as caught:
+                monitor.is_domain_available('free.com')
+            self.assertEqual(caught.exception.category, category)
+
+    def test_unhealthy_failure_is_retried_and_counted(self):
+        self.failures.append(socket.timeout("timed out"))
+        self.assertFalse(self.monitor.is_domain_available('taken.com'))
+        self.assertEqual(len(self.queries), 2)
+        health = self.monitor.servers['whois.stub.example']
+        self.assertEqual(health.retries, 1)
+        self.assertEqual((health.outcomes['timeout'], health.outcomes['ok']), (1, 1))
+        self.assertEqual(health.consecutive_failures, 0)
+
+    def test_circuit_breaker(self):
+        monitor = self.make_monitor(retries=0, failure_threshold=2, cooldown=30.0)
+        health = monitor.health('whois.stub.example')
+        self.failures.extend([socket.timeout("timed out")] * 2)
+        for _ in range(2):
+            self.assertRaises(WhoisLookupError, monitor.is_domain_available, 'taken.com')
+        self.assertEqual((health.state, health.cooldown), ('open', 30.0)) # Tripped after 'failure_threshold' failures in a row.
+
+        with self.assertRaises(WhoisLookupError) as caught:
+            monitor.is_domain_available('taken.com')
+        self.assertEqual(caught.exception.category, 'circuit open')
+        self.assertEqual(len(self.queries), 2) # Failed fast without asking the server.
+
+        health.open_until = 0.0 # The cooldown is over.
+        self.assertEqual(monitor.acquire('whois.stub.example'), monitor.timeout) # One trial query is let through...
+        self.assertEqual(health.state, 'half-open')
+        self.assertIsNone(monitor.acquire('whois.stub.example')) # ...and only one.
+        monitor.record('com', 'whois.stub.example', 'timeout', 0.1) # The trial fails.
+        self.assertEqual((health.state, health.cooldown), ('open', 60.0)) # Open again, for twice as long.
+
+        health.open_until = 0.0
+        self.assertFalse(monitor.is_domain_available('taken.com')) # This trial succeeds and closes the circuit.
+        self.assertEqual((health.state, health.cooldown, health.consecutive_failures), ('closed', 0.0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()